@@ -351,7 +351,14 @@ class SampleBasedPredictivePosterior(BasePredictivePosterior):
         cg_kwargs = cg_kwargs or {}
         return_on_device = (
                 self.observation_cov.device if return_on_device is None else return_on_device)
+        def observation_cov_closure(v):
+            # v.shape[1] may be smaller than batch_size if some samples converged already in CG
+            return self.observation_cov(v.T.reshape(
+                    v.shape[1], 1, *self.observation_cov.trafo.obs_shape)).view(
+                            v.shape[1], self.observation_cov.shape[0]).T
+
         with torch.no_grad():
+            noise_std = self.observation_cov.log_noise_variance.exp()**.5
             for _ in tqdm(range(num_batches), desc='sample_via_matheron',
                     miniters=num_batches//100):
 
@@ -361,8 +368,7 @@ class SampleBasedPredictivePosterior(BasePredictivePosterior):
                     )
                 samples = self.observation_cov.trafo(x_samples)
 
-                noise_term = (self.observation_cov.log_noise_variance.exp()**.5) * torch.randn_like(
-                        samples)
+                noise_term = noise_std * torch.randn_like(samples)
 
                 samples = (noise_term - samples).view(batch_size, -1)
 
@@ -371,10 +377,6 @@ class SampleBasedPredictivePosterior(BasePredictivePosterior):
                         cov_obs_mat_chol.T, torch.linalg.solve_triangular(
                             cov_obs_mat_chol, samples.T, upper=False), upper=True).T
                 else:
-                    def observation_cov_closure(v):
-                        return self.observation_cov(v.T.reshape(
-                                batch_size, 1, *self.observation_cov.trafo.obs_shape)).view(
-                                        batch_size, self.observation_cov.shape[0]).T
                     samples_T, residual_norm = cg(
                             observation_cov_closure, samples.T, **cg_kwargs)
                     residual_norm_list.append(residual_norm)
@@ -42,6 +42,13 @@ def _add_grads(params: Iterable, grad_dict: Dict) -> None:
             param.grad += grad_dict[param]
 
 
+def _save_atomic(obj, filepath: str) -> None:
+    # write to a temporary file first, s.t. an interrupted save does not leave a corrupt checkpoint
+    tmp_filepath = filepath + '.tmp'
+    torch.save(obj, tmp_filepath)
+    os.replace(tmp_filepath, filepath)
+
+
 def _clamp_params_min(params: Iterable, min: float) -> None:
     # pylint: disable=redefined-builtin
     if min != -np.inf:
@@ -122,9 +129,16 @@ def marginal_likelihood_hyperparams_optim(
                 Maximum number of CG iterations.
             ``'rtol'`` : float
                 Tolerance at which to stop early (before ``max_iter``).
+            ``'stop_updating_after'`` : float, optional
+                Residual norm below which CG stops updating a single probe.
+                The default is ``1e-10``.
             ``'use_log_re_variant'`` : bool
                 Whether to use the low precision arithmetic variant by Maddox et al.,
                 :meth:`linear_log_cg_re`.
+            ``'use_cuda_side_stream'`` : bool, optional
+                Whether to overlap the probe-side products with the CG solve on a separate
+                CUDA stream (see :func:`approx_observation_cov_log_det_grads`).
+                The default is ``False``.
 
         ``'include_predcp'`` : bool
             Whether to include the predictive complexity prior term.
@@ -148,6 +162,9 @@ def marginal_likelihood_hyperparams_optim(
             ``'scale'`` : float
                 Additional scaling factor for the PredCP term.
                 See also ``optim_kwargs['predcp']['gamma']``.
+        ``'checkpoint_freq'`` : int, optional
+            Number of iterations between saving checkpoints of the optimizer and
+            ``observation_cov`` state dicts. The default is ``200``.
     log_path : str, optional
         Path for saving tensorboard logs. This function creates a sub-folder in ``log_path``,
         starting with the current time. The default is ``'./'``.
@@ -181,6 +198,13 @@ def marginal_likelihood_hyperparams_optim(
             # params ~ N(0, parameter_cov)
             # E[f] == E[h(params)] == h(0) == recon - J @ map_weights
             image_mean = recon - observation_cov.image_cov.lin_op(map_weights[None])
+        predcp_scale = (optim_kwargs['predcp']['scale'] *
+                observation.numel() * optim_kwargs['predcp']['gamma'])
+        params_under_predcp = []
+        for prior_under_predcp in inner_cov.priors_per_prior_type[GPprior]:
+            params_under_predcp += list(prior_under_predcp.parameters())
+
+    checkpoint_freq = optim_kwargs.get('checkpoint_freq', 200)
 
     optimizer = torch.optim.Adam(observation_cov.parameters(), lr=optim_kwargs['lr'])
     if optim_kwargs['scheduler']['use_scheduler']:
@@ -202,13 +226,9 @@ def marginal_likelihood_hyperparams_optim(
                     prior_list_under_predcp=inner_cov.priors_per_prior_type[GPprior],
                     image_mean=image_mean,
                     num_samples=optim_kwargs['predcp']['num_samples'],
-                    scale=(optim_kwargs['predcp']['scale'] *
-                            observation.numel() * optim_kwargs['predcp']['gamma']),
+                    scale=predcp_scale,
                     )
 
-                params_under_predcp = []
-                for prior_under_predcp in inner_cov.priors_per_prior_type[GPprior]:
-                    params_under_predcp += list(prior_under_predcp.parameters())
                 _add_grads(params=params_under_predcp, grad_dict=predcp_grads)
             else:
                 predcp_shifted_loss = torch.zeros(1, device=observation_cov.device)
@@ -229,8 +249,13 @@ def marginal_likelihood_hyperparams_optim(
                     num_probes=optim_kwargs['num_probes'],
                     max_cg_iter=optim_kwargs['linear_cg']['max_iter'],
                     cg_rtol=optim_kwargs['linear_cg']['rtol'],
+                    cg_stop_updating_after=optim_kwargs['linear_cg'].get(
+                            'stop_updating_after', 1e-10),
                     use_log_re_variant=optim_kwargs['linear_cg']['use_log_re_variant'],
-                    use_preconditioned_probes=optim_kwargs['linear_cg']['use_preconditioned_probes']
+                    use_preconditioned_probes=optim_kwargs['linear_cg'][
+                            'use_preconditioned_probes'],
+                    use_cuda_side_stream=optim_kwargs['linear_cg'].get(
+                            'use_cuda_side_stream', False)
                 )
 
                 _add_grads(params=observation_cov.parameters(), grad_dict=log_det_grads)
@@ -253,29 +278,33 @@ def marginal_likelihood_hyperparams_optim(
             _clamp_params_min(
                     params=inner_cov.log_variances, min=optim_kwargs['min_log_variance'])
 
-            if (i+1) % 200 == 0:
-                torch.save(optimizer.state_dict(),
+            if (i+1) % checkpoint_freq == 0:
+                _save_atomic(optimizer.state_dict(),
                     f'optimizer_{comment}_iter_{i+1}.pt')
-                torch.save(observation_cov.state_dict(),
+                _save_atomic(observation_cov.state_dict(),
                     f'observation_cov_{comment}_iter_{i+1}.pt')
 
+            scalars = {}
             for prior_type, priors in inner_cov.priors_per_prior_type.items():
 
                 prior_type_name = _get_prior_type_name(prior_type)
 
                 for k, prior in enumerate(priors):
                     if issubclass(prior_type, (BaseGaussPrior, IsotropicPrior)):
-                        writer.add_scalar(f'{prior_type_name}_variance_{k}',
-                                torch.exp(prior.log_variance).item(), i)
+                        scalars[f'{prior_type_name}_variance_{k}'] = torch.exp(prior.log_variance)
                         if issubclass(prior_type, GPprior):
-                            writer.add_scalar(f'{prior_type_name}_lengthscale_{k}',
-                                    torch.exp(prior.log_lengthscale).item(), i)
-
-            writer.add_scalar('observation_error_norm', observation_error_norm.item(), i)
-            writer.add_scalar('weights_prior_norm', weights_prior_norm.item(), i)
-            writer.add_scalar('predcp_shifted', -predcp_shifted_loss.item(), i)
-            writer.add_scalar('observation_noise_variance',
-                    torch.exp(observation_cov.log_noise_variance).item(), i)
+                            scalars[f'{prior_type_name}_lengthscale_{k}'] = torch.exp(
+                                    prior.log_lengthscale)
+
+            scalars['observation_error_norm'] = observation_error_norm
+            scalars['weights_prior_norm'] = weights_prior_norm
+            scalars['predcp_shifted'] = -predcp_shifted_loss
+            scalars['observation_noise_variance'] = torch.exp(observation_cov.log_noise_variance)
             if not isinstance(observation_cov, MatmulObservationCov):
-                writer.add_scalar('log_det_grad_cg_mean_residual',
-                        log_det_residual_norm.mean().item(), i)
+                scalars['log_det_grad_cg_mean_residual'] = log_det_residual_norm.mean()
+
+            # transfer all values at once instead of synchronizing via .item() for each of them
+            scalar_values = torch.stack(
+                    [v.detach().reshape(()) for v in scalars.values()]).tolist()
+            for tag, value in zip(scalars.keys(), scalar_values):
+                writer.add_scalar(tag, value, i)
@@ -15,9 +15,11 @@ def approx_observation_cov_log_det_grads(
         precon: BasePreconditioner = None,
         max_cg_iter: int = 50,
         cg_rtol: float = 1e-3,
+        cg_stop_updating_after: float = 1e-10,
         num_probes: int = 1,
         use_log_re_variant: bool = False,
         use_preconditioned_probes: bool = False,
+        use_cuda_side_stream: bool = False,
         ignore_numerical_warning: bool = False
         ) -> Tuple[Dict[nn.Parameter, Tensor], Tensor]:
     """
@@ -36,6 +38,9 @@ def approx_observation_cov_log_det_grads(
         Maximum number of CG iterations. The default is ``50``.
     cg_rtol : float, optional
         Tolerance at which to stop early (before ``max_iter``). The default is ``1e-3``.
+    cg_stop_updating_after : float, optional
+        Residual norm below which the CG iterations for a single probe are stopped, while other
+        probes may still continue. The default is ``1e-10``.
     num_probes : int, optional
         Number of probes to use for the trace estimator. The default is ``1``.
     use_log_re_variant : bool, optional
@@ -48,6 +53,12 @@ def approx_observation_cov_log_det_grads(
         .. [1] J.R. Gardner, G. Pleiss, D. Bindel, K.Q. Weinberger, A.G. Wilson, 2018,
                "GPyTorch: Blackbox Matrix-Matrix Gaussian Process Inference with GPU
                Acceleration". https://arxiv.org/pdf/1809.11165v6.pdf
+    use_cuda_side_stream : bool, optional
+        Whether to compute ``lin_op_transposed @ trafo_adjoint @ v`` on a separate CUDA stream,
+        overlapping with the CG solve (which it does not depend on). Only has an effect if
+        ``observation_cov.device`` is a CUDA device. If ``False``, this product is instead batched
+        together with the one for the CG solution after CG has finished.
+        The default is ``False``.
     ignore_numerical_warning : bool, optional
         Not implemented yet. Should control whether numerical warnings are ignored.
         The default is ``False``.
@@ -75,17 +86,39 @@ def approx_observation_cov_log_det_grads(
     # => d image_cov / d params ==
     #    image_cov.lin_op @ d image_cov.inner_cov / d params @ image_cov.lin_op_transposed
 
+    # the noise variance is constant during CG, so compute it only once
+    noise_variance = log_noise_variance.detach().exp()
+
     def observation_cov_closure(v):
-        return observation_cov(v.T.reshape(num_probes, 1, *observation_cov.trafo.obs_shape)
-                ).view(num_probes, observation_cov.shape[0]).T
+        # v.shape[1] may be smaller than num_probes if some probes converged already in CG
+        return observation_cov(v.T.reshape(v.shape[1], 1, *observation_cov.trafo.obs_shape),
+                noise_variance=noise_variance).view(v.shape[1], observation_cov.shape[0]).T
+
+    def lin_op_transposed_trafo_adjoint_closure(v):
+        # v.shape[1] is num_probes or 2 * num_probes (if batching both sides)
+        v = trafo.trafo_adjoint_flat(v)  # (im_numel, batch_size)
+        v = v.T.reshape(v.shape[1], 1, *trafo.im_shape)
+        return image_cov.lin_op_transposed(v)  # (batch_size, nn_params_numel)
 
     precon_closure = None if precon is None else precon.get_closure()
     if not use_preconditioned_probes:
+        # re-sample into a persistent buffer instead of allocating new probes in every call
+        # pylint: disable=protected-access
+        probe_buf = observation_cov._probe_buf
+        device = torch.device(observation_cov.device)
+        if device.type == 'cuda' and device.index is None:
+            # tensor devices always have an index, and e.g. 'cuda' != 'cuda:0'
+            device = torch.device('cuda', torch.cuda.current_device())
+        if (probe_buf is None or probe_buf.shape != (observation_cov.shape[0], num_probes)
+                or probe_buf.device != device):
+            probe_buf = torch.empty(
+                    observation_cov.shape[0], num_probes, device=observation_cov.device)
+            observation_cov._probe_buf = probe_buf
         v_flat = generate_probes_bernoulli(
             side_length=observation_cov.shape[0],
             num_probes=num_probes,
-            device=observation_cov.device,
-            jacobi_vector=None)  # (obs_numel, num_probes)
+            jacobi_vector=None,
+            out=probe_buf)  # (obs_numel, num_probes)
     else:
         assert precon is not None
         # The preconditioned BBMM is here used, proposed in [1]_. Refer to section 4.1 as well as
@@ -101,23 +134,39 @@ def approx_observation_cov_log_det_grads(
 
     grads = {}
 
+    use_cuda_side_stream = (
+            use_cuda_side_stream and torch.device(observation_cov.device).type == 'cuda')
+
     ## gradients for parameters in image_cov
     with torch.no_grad():
+        if use_cuda_side_stream:
+            side_stream = torch.cuda.Stream(device=observation_cov.device)
+            side_stream.wait_stream(torch.cuda.current_stream())  # v_flat must be ready
+            with torch.cuda.stream(side_stream):
+                v_flat_right = precon_closure(v_flat) if use_preconditioned_probes else v_flat
+                v_right = lin_op_transposed_trafo_adjoint_closure(v_flat_right)
         v_obs_left_flat, residual_norm = cg(
                 observation_cov_closure, v_flat, precon_closure=precon_closure,
-                max_niter=max_cg_iter, rtol=cg_rtol, use_log_re_variant=use_log_re_variant,
+                max_niter=max_cg_iter, rtol=cg_rtol, stop_updating_after=cg_stop_updating_after,
+                use_log_re_variant=use_log_re_variant,
                 ignore_numerical_warning=ignore_numerical_warning
             )
-        v_left = trafo.trafo_adjoint_flat(v_obs_left_flat)  # (im_numel, num_probes)
-        v_left = v_left.T.reshape(num_probes, 1, *trafo.im_shape)
-        v_left = image_cov.lin_op_transposed(v_left)  # (num_probes, nn_params_numel)
+        if use_cuda_side_stream:
+            v_left = lin_op_transposed_trafo_adjoint_closure(v_obs_left_flat)
+            torch.cuda.current_stream().wait_stream(side_stream)
+            # tell the caching allocator that these are used on the current stream from now on
+            v_flat_right.record_stream(torch.cuda.current_stream())
+            v_right.record_stream(torch.cuda.current_stream())
+            v_flat = v_flat_right
+        else:
+            if use_preconditioned_probes:
+                v_flat = precon_closure(v_flat)
+            # apply trafo_adjoint and lin_op_transposed to both sides in a single batch
+            v_left_right = lin_op_transposed_trafo_adjoint_closure(
+                    torch.cat([v_obs_left_flat, v_flat], dim=1))
+            # v_left_right.shape: (2 * num_probes, nn_params_numel)
+            v_left, v_right = v_left_right[:num_probes], v_left_right[num_probes:]
         # v_left = v.T @ observation_cov**-1 @ trafo @ lin_op
-
-        if use_preconditioned_probes:
-            v_flat = precon_closure(v_flat)
-        v_right = trafo.trafo_adjoint_flat(v_flat)
-        v_right = v_right.T.reshape(num_probes, 1, *trafo.im_shape)
-        v_right = image_cov.lin_op_transposed(v_right) # (num_probes, nn_params_numel)
         # v_right = lin_op_transposed @ trafo_adjoint @ v
 
     # estimate expected value E(v_left @ d image_cov.inner_cov / d params @ v_right.T)
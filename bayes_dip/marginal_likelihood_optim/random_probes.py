@@ -10,7 +10,8 @@ def generate_probes_bernoulli(
         num_probes : int,
         dtype=None,
         device=None,
-        jacobi_vector : Optional[Tensor] = None
+        jacobi_vector : Optional[Tensor] = None,
+        out : Optional[Tensor] = None
         ) -> Tensor:
     """
     Return Bernoulli-distributed random probes.
@@ -27,13 +28,21 @@ def generate_probes_bernoulli(
         Device.
     jacobi_vector : Tensor, optional
         If specified, multiply the probes with ``jacobi_vector.pow(0.5)``.
+    out : Tensor, optional
+        If specified, the probes are sampled in-place into this tensor, which is then returned
+        (``dtype`` and ``device`` are ignored in this case).
+        Shape: ``(side_length, num_probes)``.
 
     Returns
     -------
     probe_vectors : Tensor
         Probe vectors. Shape: ``(side_length, num_probes)``.
     """
-    probe_vectors = torch.empty(side_length, num_probes, dtype=dtype, device=device)
+    if out is None:
+        probe_vectors = torch.empty(side_length, num_probes, dtype=dtype, device=device)
+    else:
+        assert out.shape == (side_length, num_probes)
+        probe_vectors = out
     probe_vectors.bernoulli_().mul_(2).add_(-1)
     if jacobi_vector is not None:
         assert len(jacobi_vector.shape) == 1
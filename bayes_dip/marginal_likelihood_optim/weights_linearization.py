@@ -65,6 +65,10 @@ def weights_linearization(
             optimization).
         ``'wd'`` : float
             Weight decay rate.
+        ``'use_torch_compile'`` : bool, optional
+            Whether to compile the optimization step with
+            ``torch.compile(..., mode='reduce-overhead')`` (requires ``torch>=2.0``).
+            The default is ``False``.
 
     Returns
     -------
@@ -77,8 +81,13 @@ def weights_linearization(
     nn_model = neural_basis_expansion.nn_model
     nn_input = neural_basis_expansion.nn_input
 
-    with torch.no_grad():
-        nn_model_recon = nn_model(nn_input, saturation_safety=True)
+    nn_model_recon = None
+    if not optim_kwargs['simplified_eqn']:
+        # only the "standard" model is offset by the network output, so the simplified model can
+        # skip this forward pass; inference mode is fine since the result is only used as a
+        # constant offset (functorch transforms must not run in inference mode, though)
+        with torch.inference_mode():
+            nn_model_recon = nn_model(nn_input, saturation_safety=True)
 
     lin_weights_fd = (
             nn.Parameter(torch.zeros_like(map_weights)) if optim_kwargs['simplified_eqn']
@@ -87,46 +96,67 @@ def weights_linearization(
 
     precision = optim_kwargs['noise_precision']
 
-    with tqdm(range(optim_kwargs['iterations']),
-                miniters=optim_kwargs['iterations']//100) as pbar, \
-            eval_mode(nn_model):
-        for _ in pbar:
+    observation = observation.view(1, 1, *trafo.obs_shape)
+    norm_grad_scale = - 2 / observation.numel() * precision
+
+    def _step(lin_weights_fd):
+        if optim_kwargs['simplified_eqn']:
+            fd_vector = lin_weights_fd
+        else:
+            fd_vector = lin_weights_fd - map_weights
+
+        lin_recon = neural_basis_expansion.jvp(fd_vector[None, :]).squeeze(dim=1)
 
-            if optim_kwargs['simplified_eqn']:
-                fd_vector = lin_weights_fd
-            else:
-                fd_vector = lin_weights_fd - map_weights
+        if not optim_kwargs['simplified_eqn']:
+            lin_recon = lin_recon + nn_model_recon
 
-            lin_recon = neural_basis_expansion.jvp(fd_vector[None, :]).detach().squeeze(dim=1)
+        if use_sigmoid:
+            lin_recon = lin_recon.sigmoid()
 
-            if not optim_kwargs['simplified_eqn']:
-                lin_recon = lin_recon + nn_model_recon
+        proj_lin_recon = trafo(lin_recon)
 
-            if use_sigmoid:
-                lin_recon = lin_recon.sigmoid()
+        norm_grad = trafo.trafo_adjoint( observation - proj_lin_recon )
+        tv_grad = batch_tv_grad(lin_recon)
 
-            proj_lin_recon = trafo(lin_recon)
+        # loss = (torch.nn.functional.mse_loss(
+        #                 proj_lin_recon, observation.view(*proj_lin_recon.shape))
+        #         + optim_kwargs['gamma'] * tv_loss(lin_recon))
+        v = norm_grad_scale * norm_grad + optim_kwargs['gamma'] * tv_grad
 
-            observation = observation.view(*proj_lin_recon.shape)
-            norm_grad = trafo.trafo_adjoint( observation - proj_lin_recon )
-            tv_grad = batch_tv_grad(lin_recon)
+        if use_sigmoid:
+            v = v * lin_recon * (1 - lin_recon)
 
-            # loss = (torch.nn.functional.mse_loss(
-            #                 proj_lin_recon, observation.view(*proj_lin_recon.shape))
-            #         + optim_kwargs['gamma'] * tv_loss(lin_recon))
-            v = - 2 / observation.numel() * precision * norm_grad + optim_kwargs['gamma'] * tv_grad
+        grads_vec = neural_basis_expansion.vjp(v.view(1, 1, 1, *trafo.im_shape)).squeeze(dim=0)
+        return grads_vec, lin_recon
 
-            if use_sigmoid:
-                v = v * lin_recon * (1 - lin_recon)
+    use_torch_compile = optim_kwargs.get('use_torch_compile', False)
+    if use_torch_compile:
+        assert hasattr(torch, 'compile'), '`use_torch_compile` requires torch>=2.0'
+        step = torch.compile(_step, mode='reduce-overhead', fullgraph=False, dynamic=False)
+    else:
+        step = _step
+
+    with tqdm(range(optim_kwargs['iterations']),
+                miniters=optim_kwargs['iterations']//100) as pbar, \
+            eval_mode(nn_model), torch.no_grad():
+        # gradients are computed manually via neural_basis_expansion.vjp, so no graph is needed
+        for _ in pbar:
 
             optimizer.zero_grad()
 
-            grads_vec = neural_basis_expansion.vjp(v.view(1, 1, 1, *trafo.im_shape)).squeeze(dim=0)
-            lin_weights_fd.grad = grads_vec + optim_kwargs['wd'] * lin_weights_fd.detach()
+            if use_torch_compile and hasattr(torch, 'compiler') and hasattr(
+                    torch.compiler, 'cudagraph_mark_step_begin'):
+                torch.compiler.cudagraph_mark_step_begin()
+            grads_vec, lin_recon = step(lin_weights_fd)
+            lin_weights_fd.grad = grads_vec + optim_kwargs['wd'] * lin_weights_fd
             optimizer.step()
 
             pbar.set_description(
-                    f'psnr={PSNR(lin_recon.detach().cpu().numpy(),ground_truth.cpu().numpy()):.1f}',
+                    f'psnr={PSNR(lin_recon.cpu().numpy(),ground_truth.cpu().numpy()):.1f}',
                     refresh=False)
 
+    if use_torch_compile:
+        # outputs of a CUDA graph are overwritten by later replays
+        lin_recon = lin_recon.clone()
+
     return lin_weights_fd.detach(), lin_recon.detach()
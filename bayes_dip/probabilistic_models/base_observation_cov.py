@@ -42,6 +42,9 @@ class BaseObservationCov(nn.Module, ABC):
                 torch.tensor(float(np.log(init_noise_variance)), device=self.device),
             )
 
+        # probe buffer that is re-used by approx_observation_cov_log_det_grads
+        self._probe_buf = None
+
     @property
     def shape(self) -> Tuple[int, int]:
         """Shape of the (theoretical) matrix representation."""
@@ -32,6 +32,7 @@ class LowRankObservationCov(BaseObservationCov):
             load_approx_basis: Optional[Union[str, dict]] = None,
             requires_grad=True,
             device=None,
+            random_matrix_dtype: Optional[torch.dtype] = None,
             **update_kwargs,
             ) -> None:
         """
@@ -45,8 +46,16 @@ class LowRankObservationCov(BaseObservationCov):
             Initial value for noise variance parameter. The default is ``1.``.
         low_rank_rank_dim : int, optional
             Number of dimensions of the low-rank approximation. The default is ``100``.
+            See ``oversampling_param`` for the number of random vectors used for the sketch.
         oversampling_param : int, optional
             Number of oversampling dimensions for the low-rank approximation. The default is ``10``.
+            The total number of random vectors, ``low_rank_rank_dim + oversampling_param``, is
+            rounded up to a multiple of ``update_kwargs['batch_size']`` (if specified and not
+            ``'auto'``), such that all batches in :meth:`get_low_rank_observation_cov_basis` are
+            full. The additional vectors increase the effective oversampling (e.g. from ``210``
+            to ``224`` random vectors for ``low_rank_rank_dim=200, oversampling_param=10,
+            batch_size=32``) and change the random matrix drawn for a given seed, so the
+            approximation differs from the one obtained with ``batch_size=1``.
         load_state_dict : str or dict, optional
             State dict (or path to it) to load.
         load_approx_basis : str or dict, optional
@@ -62,6 +71,11 @@ class LowRankObservationCov(BaseObservationCov):
         device : str or torch.device, optional
             Device. If ``None`` (the default), ``'cuda:0'`` is chosen if available or ``'cpu'``
             otherwise.
+        random_matrix_dtype : torch.dtype, optional
+            Data type for storing the random matrix, e.g. ``torch.bfloat16`` to halve its memory
+            footprint. Each batch is cast to the default dtype right before it is used, so the
+            computations (and the accumulated sketch) keep the default precision.
+            If ``None`` (the default), the default dtype is used.
         update_kwargs : dict, optional
             Keyword arguments passed to :meth:`update`.
         """
@@ -89,7 +103,11 @@ class LowRankObservationCov(BaseObservationCov):
 
         self.low_rank_rank_dim = low_rank_rank_dim
         self.oversampling_param = oversampling_param
-        self.random_matrix = self._assemble_random_matrix()
+        self.random_matrix_dtype = random_matrix_dtype
+        batch_size = update_kwargs.get('batch_size', 1)
+        self.random_matrix = self._assemble_random_matrix(
+                batch_size=batch_size if batch_size != 'auto' else 1)
+        self._qr_pin_bufs = None  # pinned staging buffers for QR on CPU, see _qr_on_cpu
 
         if load_approx_basis is None:
             self.update(**update_kwargs)
@@ -128,18 +146,70 @@ class LowRankObservationCov(BaseObservationCov):
                 'sysmat': self.sysmat.detach().cpu()},
                 filepath)
 
-    def _assemble_random_matrix(self) -> Tensor:
-        low_rank_rank_dim = self.low_rank_rank_dim + self.oversampling_param
+    def _assemble_random_matrix(self, batch_size: int = 1) -> Tensor:
+        # round up to full batches; the additional rows just increase the oversampling
+        num_random_vectors = ceil(
+                (self.low_rank_rank_dim + self.oversampling_param) / batch_size) * batch_size
         random_matrix = torch.randn(
-                (low_rank_rank_dim, np.prod(self.trafo.obs_shape)),
-                device=self.device)
+                (num_random_vectors, np.prod(self.trafo.obs_shape)),
+                dtype=self.random_matrix_dtype, device=self.device)
         return random_matrix
 
+    def resample_random_matrix(self) -> None:
+        """
+        Re-sample the random matrix used by :meth:`get_low_rank_observation_cov_basis` (in-place).
+
+        By default, the same random matrix is used for all calls to :meth:`update`.
+        """
+        self.random_matrix.normal_()
+
+    def _low_rank_term_batch(self, rnd_vect: Tensor) -> Tensor:
+        # apply observation cov without noise variance term
+        v = self.trafo.trafo_adjoint(rnd_vect)
+        v = self.image_cov(v)
+        v = self.trafo(v)
+        return v
+
+    def _get_auto_batch_size(self, max_memory_fraction: float = 0.5) -> int:
+        num_random_vectors = self.random_matrix.shape[0]
+        device = torch.device(self.device)
+        if device.type != 'cuda':
+            return num_random_vectors
+        # measure the memory needed for a single vector, and fill a fraction of the free memory;
+        # the peak memory stats are shared by the process, so they are only read, not reset
+        torch.cuda.synchronize(device)
+        memory_before = torch.cuda.memory_allocated(device)
+        with torch.set_grad_enabled(self.requires_grad):
+            self._low_rank_term_batch(
+                    self.random_matrix[:1, None, None, :].to(dtype=torch.get_default_dtype()))
+        torch.cuda.synchronize(device)
+        memory_per_vector = max(torch.cuda.max_memory_allocated(device) - memory_before, 1)
+        free_memory, _ = torch.cuda.mem_get_info(device)
+        max_batch_size = int(max_memory_fraction * free_memory) // memory_per_vector
+        return max(1, min(num_random_vectors, max_batch_size))
+
+    def _qr_on_cpu(self, v_cov_obs_mat: Tensor) -> Tensor:
+        device = torch.device(self.device)
+        if device.type != 'cuda' or v_cov_obs_mat.requires_grad:
+            return torch.linalg.qr(v_cov_obs_mat.cpu())[0].to(device)
+        # stage via page-locked memory, allowing for fast DMA copies and an asynchronous upload
+        if self._qr_pin_bufs is None or self._qr_pin_bufs[0].shape != v_cov_obs_mat.shape:
+            self._qr_pin_bufs = (
+                    torch.empty(v_cov_obs_mat.shape, dtype=v_cov_obs_mat.dtype, pin_memory=True),
+                    torch.empty(v_cov_obs_mat.shape, dtype=v_cov_obs_mat.dtype, pin_memory=True))
+        v_pin, Q_pin = self._qr_pin_bufs
+        v_pin.copy_(v_cov_obs_mat, non_blocking=True)
+        torch.cuda.current_stream(device).synchronize()  # v_pin is read on the host next
+        torch.linalg.qr(v_pin, out=(Q_pin, torch.empty(0, dtype=v_pin.dtype)))
+        # Q_pin must not be overwritten before this copy has finished; the next call to this
+        # function synchronizes before writing to the buffers again
+        return Q_pin.to(device, non_blocking=True)
+
     def get_low_rank_observation_cov_basis(self,
         use_cpu: bool = False,
         eps: float = 1e-1,
         verbose: bool = True,
-        batch_size: int = 1,
+        batch_size: Union[int, str] = 1,
         ):
 
         """
@@ -159,8 +229,17 @@ class LowRankObservationCov(BaseObservationCov):
             The default is ``1e-3``.
         verbose : bool, optional
             If ``True``, print eigenvalue information. The default is ``True``.
-        batch_size : int, optional
+        batch_size : int or str, optional
             Batch size for multiplying with the observation covariance.
+            If ``'auto'``, the batch size is chosen such that the multiplications fit into half of
+            the free GPU memory (measured via :func:`torch.cuda.mem_get_info`), or all random
+            vectors are processed in a single batch if running on CPU. On GPU, this runs one
+            additional trial batch of size ``1`` to measure the memory needed per vector, as the
+            difference between :func:`torch.cuda.max_memory_allocated` after the trial batch and
+            :func:`torch.cuda.memory_allocated` right before it. The peak memory stats are not
+            reset, so if an earlier peak of the process exceeds the peak of the trial batch, the
+            per-vector memory is overestimated and a smaller batch size is chosen.
+            Larger batches need more memory, but reduce the number of (small) kernel launches.
             The default is ``1``.
 
         Returns
@@ -171,14 +250,19 @@ class LowRankObservationCov(BaseObservationCov):
             Eigenvalues. Shape: ``(self.low_rank_rank_dim)``
         """
 
-        num_batches = ceil((self.low_rank_rank_dim + self.oversampling_param) / batch_size)
+        if batch_size == 'auto':
+            batch_size = self._get_auto_batch_size()
+        num_batches = ceil(self.random_matrix.shape[0] / batch_size)
         # step 2 in Algorithm 4.1 of Halko et al.
-        v_cov_obs_mat = []
+        # fill preallocated rows instead of concatenating the batches afterwards
+        dtype = torch.get_default_dtype()  # self.random_matrix may be stored in lower precision
+        v_cov_obs_mat = torch.empty(self.random_matrix.shape, dtype=dtype, device=self.device)
         # image_cov might require grads (shared module), so disable grads if not self.requires_grad
         with torch.set_grad_enabled(self.requires_grad):
             for i in tqdm(range(num_batches), miniters=num_batches//100,
                     desc='get_low_rank_observation_cov_basis'):
-                rnd_vect = self.random_matrix[i * batch_size:(i+1) * batch_size, None, None, :]
+                rnd_vect = self.random_matrix[
+                        i * batch_size:(i+1) * batch_size, None, None, :].to(dtype=dtype)
                 eff_batch_size = rnd_vect.shape[0]
                 if eff_batch_size < batch_size:
                     rnd_vect = torch.cat(
@@ -188,32 +272,35 @@ class LowRankObservationCov(BaseObservationCov):
                                     device=rnd_vect.device)
                             ]
                         )
-                # apply observation cov without noise variance term
-                v = self.trafo.trafo_adjoint(rnd_vect)
-                v = self.image_cov(v)
-                v = self.trafo(v)
-                if eff_batch_size < batch_size:
-                    v = v[:eff_batch_size]
-                v_cov_obs_mat.append(v)
-        v_cov_obs_mat = torch.cat(v_cov_obs_mat)
-        v_cov_obs_mat = v_cov_obs_mat.view(*v_cov_obs_mat.shape[:1], -1).T  # new shape: (dy, L)
+                v = self._low_rank_term_batch(rnd_vect)
+                v_cov_obs_mat[i * batch_size:i * batch_size + eff_batch_size] = v.view(
+                        batch_size, -1)[:eff_batch_size]
+        v_cov_obs_mat = v_cov_obs_mat.T  # new shape: (dy, L)
         # step 3 in Algorithm 4.1 of Halko et al.
-        Q, _ = torch.linalg.qr(
-                v_cov_obs_mat.cpu() if use_cpu else v_cov_obs_mat)  # shape: (dy, L), assuming L<=dy
-        Q = Q if not use_cpu else Q.to(self.device)
+        Q = (self._qr_on_cpu(v_cov_obs_mat) if use_cpu else
+                torch.linalg.qr(v_cov_obs_mat)[0])  # shape: (dy, L), assuming L<=dy
         Q = Q[:, :self.low_rank_rank_dim]
         # step 1 in Algorithm 5.6 of Halko et al.
-        B = torch.linalg.lstsq(self.random_matrix @ Q, v_cov_obs_mat.T @ Q).solution
+        random_matrix_Q = self.random_matrix.to(dtype=dtype) @ Q
+        v_cov_obs_mat_Q = v_cov_obs_mat.T @ Q
+        if random_matrix_Q.shape[0] == random_matrix_Q.shape[1]:
+            # no oversampling, so the system is square
+            B = torch.linalg.solve(random_matrix_Q, v_cov_obs_mat_Q)
+        else:
+            B = torch.linalg.lstsq(random_matrix_Q, v_cov_obs_mat_Q).solution
         # step 2 in Algorithm 5.6 of Halko et al.
-        L, V = torch.linalg.eig(B)
+        # B approximates a symmetric matrix, so use the symmetric solver on its symmetric part
+        L, V = torch.linalg.eigh(0.5 * (B + B.T))
+        L, V = L.flip(0), V.flip(1)  # descending order
         # step 3 in Algorithm 5.6 of Halko et al.
-        U = Q @ V.real
+        U = Q @ V
         if verbose:
             print(
-                    f'L.min: {L.real.min()}, '
-                    f'L.max: {L.real.max()}, '
-                    f'L.num_vals_below_{eps}: {(L.real < eps).sum()}\n')
-        return U, L.real.clamp(min=eps)
+                    f'L.min: {L.min()}, '
+                    f'L.max: {L.max()}, '
+                    f'L.num_vals_below_{eps}: {(L < eps).sum()}, '
+                    f'cond(random_matrix @ Q): {torch.linalg.cond(random_matrix_Q)}\n')
+        return U, L.clamp(min=eps)
 
     def forward(self,
             v: Tensor,
@@ -281,7 +368,7 @@ class LowRankObservationCov(BaseObservationCov):
         use_cpu: bool = False,
         eps: float = 1e-1,
         full_diag_eps: float = 1e-6,
-        batch_size: int = 1,
+        batch_size: Union[int, str] = 1,
         ) -> None:
         """
         Update the low-rank approximation and other state variables to the current parameter values.
@@ -299,8 +386,9 @@ class LowRankObservationCov(BaseObservationCov):
         full_diag_eps : float, optional
             Value to add to the noise variance in :meth:`matmul` (for stabilization).
             The default is ``1e-6``.
-        batch_size : int, optional
-            Batch size for multiplying with the observation covariance.
+        batch_size : int or str, optional
+            Batch size for multiplying with the observation covariance, or ``'auto'``
+            (see :meth:`get_low_rank_observation_cov_basis`).
             The default is ``1``.
         """
 
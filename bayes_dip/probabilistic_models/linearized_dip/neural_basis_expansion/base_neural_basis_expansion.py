@@ -53,7 +53,7 @@ class BaseNeuralBasisExpansion(ABC):
 
         self.nn_out_shape = nn_out_shape
         if self.nn_out_shape is None:
-            with torch.no_grad(), eval_mode(self.nn_model):
+            with torch.inference_mode(), eval_mode(self.nn_model):
                 self.nn_out_shape = self.nn_model(nn_input).shape
 
     @property
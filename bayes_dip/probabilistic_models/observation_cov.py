@@ -21,6 +21,7 @@ class ObservationCov(BaseObservationCov):
                 v: Tensor,
                 use_noise_variance: bool = True,
                 use_cholesky: bool = False,
+                noise_variance: Optional[Tensor] = None,
                 **kwargs
             ) -> Tensor:
         """
@@ -36,6 +37,10 @@ class ObservationCov(BaseObservationCov):
             If ``True``, :meth:`self.image_cov.forward` must support and implement the argument
             ``use_cholesky=True`` analogously.
             The default is ``False``.
+        noise_variance : Tensor, optional
+            Precomputed value of ``self.log_noise_variance.exp()``, useful to avoid re-computing it
+            when calling this method repeatedly (e.g. in CG iterations).
+            If ``None`` (the default), it is computed from :attr:`log_noise_variance`.
         kwargs : dict, optional
             Keyword arguments passed to :meth:`self.image_cov.forward`.
 
@@ -53,7 +58,12 @@ class ObservationCov(BaseObservationCov):
             v_ = self.image_cov(v_, **kwargs)
             v_ = self.trafo(v_)
 
-        v = v_ + v * self.log_noise_variance.exp() if use_noise_variance else v_
+        if use_noise_variance:
+            noise_variance = (
+                    self.log_noise_variance.exp() if noise_variance is None else noise_variance)
+            v = v_ + v * noise_variance
+        else:
+            v = v_
 
         return v
 
@@ -0,0 +1,41 @@
+"""
+Histogram kernel based on the optional dependency ``numba``, used by :func:`.plot_utils.plot_hist`.
+"""
+import numpy as np
+import numba
+
+@numba.njit(parallel=True, cache=True)
+def _uniform_hist1d(x, lo, hi, bins, out, num_threads):
+    # each thread counts into its own row, so no atomic updates are needed
+    local_counts = np.zeros((num_threads, bins), dtype=np.int64)
+    inv_width = bins / (hi - lo)
+    chunk_size = (x.shape[0] + num_threads - 1) // num_threads
+    for t in numba.prange(num_threads):  # pylint: disable=not-an-iterable
+        for i in range(t * chunk_size, min((t + 1) * chunk_size, x.shape[0])):
+            v = x[i]
+            if lo <= v <= hi:
+                idx = min(int((v - lo) * inv_width), bins - 1)
+                local_counts[t, idx] += 1
+    for t in range(num_threads):
+        for j in range(bins):
+            out[j] += local_counts[t, j]
+
+def uniform_hist1d(x, lo, hi, bins, out):
+    """
+    Add the counts of the values in ``x`` to ``out``, for ``bins`` uniform bins in ``[lo, hi]``.
+
+    Like :func:`numpy.histogram`, the last bin includes the right edge, and values outside of
+    ``[lo, hi]`` are ignored.
+
+    Parameters
+    ----------
+    x : 1D array
+        Values.
+    lo, hi : float
+        Range of the bins.
+    bins : int
+        Number of bins.
+    out : 1D array
+        Counts, to which the counts of ``x`` are added. Shape: ``(bins,)``.
+    """
+    _uniform_hist1d(x, lo, hi, bins, out, numba.get_num_threads())
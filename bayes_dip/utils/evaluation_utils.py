@@ -8,6 +8,7 @@ module's documentation).
 """
 import os
 import re
+from functools import lru_cache
 from typing import Tuple, Dict, List, Union, Optional
 import numpy as np
 import torch
@@ -121,6 +122,14 @@ def translate_path(
         path = translate_output_path(path=path, outputs_path=outputs_path)
     return path
 
+@lru_cache(maxsize=64)
+def _load_run_cfg(run_path: str):
+    # the config of a finished run does not change, so it is only parsed once per run path;
+    # it is made read-only because the same object is returned to all callers
+    cfg = OmegaConf.load(os.path.join(run_path, '.hydra', 'config.yaml'))
+    OmegaConf.set_readonly(cfg, True)
+    return cfg
+
 def get_ground_truth(
         run_path: str, sample_idx: int,
         experiment_paths: Optional[Dict] = None) -> Tensor:
@@ -260,7 +269,7 @@ def _recompute_image_noise_correction_term(
         run_path: str, sample_idx: int,
         experiment_paths: Optional[Dict] = None) -> float:
     run_path = translate_path(run_path, experiment_paths=experiment_paths)
-    cfg = OmegaConf.load(os.path.join(run_path, '.hydra', 'config.yaml'))
+    cfg = _load_run_cfg(run_path)
     ray_trafo = get_standard_ray_trafo(cfg)
     observation_cov_filename = (
             f'observation_cov_{sample_idx}.pt' if cfg.inference.load_iter is None else
@@ -302,7 +311,7 @@ def get_nn_model(
     """
     run_path = translate_path(run_path, experiment_paths=experiment_paths)
     device = device or torch.device(('cuda:0' if torch.cuda.is_available() else 'cpu'))
-    cfg = OmegaConf.load(os.path.join(run_path, '.hydra', 'config.yaml'))
+    cfg = _load_run_cfg(run_path)
     assert not cfg.dip.recon_from_randn  # would need to re-create random input
     net_kwargs = {
             'scales': cfg.dip.net.scales,
@@ -507,7 +516,7 @@ def get_stddev(run_path: str, sample_idx: int,
         Standard deviation. Shape: ``(im_size, im_size)``.
     """
     run_path = translate_path(run_path, experiment_paths=experiment_paths)
-    cfg = OmegaConf.load(os.path.join(run_path, '.hydra', 'config.yaml'))
+    cfg = _load_run_cfg(run_path)
     data, is_exact = get_density_data(
             run_path=run_path, sample_idx=sample_idx, experiment_paths=experiment_paths)
     if is_exact:
@@ -622,7 +631,7 @@ def get_image_cov(run_path: str, sample_idx: int,
     """
     run_path = translate_path(run_path, experiment_paths=experiment_paths)
     device = device or torch.device(('cuda:0' if torch.cuda.is_available() else 'cpu'))
-    cfg = OmegaConf.load(os.path.join(run_path, '.hydra', 'config.yaml'))
+    cfg = _load_run_cfg(run_path)
 
     nn_model, filtbackproj = get_nn_model(
             run_path=run_path, sample_idx=sample_idx, experiment_paths=experiment_paths,
@@ -700,7 +709,7 @@ def extract_tensorboard_scalars(
     log_file : str
         Tensorboard log filepath.
     save_as_npz : str, optional
-        File path to save the extracted scalars as a npz file.
+        File path to save the extracted scalars as a (compressed) npz file.
     tags : list of str, optional
         If specified, only extract these tags.
     """
@@ -722,9 +731,10 @@ def extract_tensorboard_scalars(
         steps = [event.step for event in events]
         values = [event.value for event in events]
         scalars[tag + '_steps'] = np.asarray(steps)
-        scalars[tag + '_scalars'] = np.asarray(values)
+        # tensorboard stores scalars in single precision, so float32 is lossless
+        scalars[tag + '_scalars'] = np.asarray(values, dtype=np.float32)
 
     if save_as_npz:
-        np.savez(save_as_npz, **scalars)
+        np.savez_compressed(save_as_npz, **scalars)
 
     return scalars
@@ -2,9 +2,10 @@
 Utilities for experiments.
 """
 
-from typing import List, Optional
+from typing import Any, List, Optional
 import os
 from warnings import warn
+from concurrent.futures import ThreadPoolExecutor
 import torch
 from torch import Tensor
 from torch.utils.data import Dataset, TensorDataset
@@ -240,3 +241,105 @@ def load_samples(
     if restrict_to_num_samples:
         samples = samples[:num_samples]
     return samples
+
+class AsyncSaver:
+    """
+    Saves (nested dicts, lists and tuples of) tensors with :func:`torch.save` in a background
+    thread.
+
+    The tensors are copied to CPU memory when :meth:`save` is called, so they may be modified
+    afterwards. CUDA tensors are copied to pinned memory with ``non_blocking=True``. The writer
+    thread then waits for the copies to finish, so the calling thread is not blocked by the
+    device-to-host transfer or the file I/O. The saved tensors are always on the CPU.
+
+    Call :meth:`close` (or use the saver as a context manager) to make sure all files are written.
+    Exceptions raised while writing are re-raised by the next call to :meth:`save` after the
+    failed write has finished, or by :meth:`wait` and :meth:`close`.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures = []
+
+    def _to_cpu(self, obj: Any, cuda_devices: set) -> Any:
+        if isinstance(obj, Tensor):
+            obj = obj.detach()
+            if obj.device.type != 'cuda':
+                return obj.clone()
+            cuda_devices.add(obj.device)
+            obj_cpu = torch.empty(obj.shape, dtype=obj.dtype, device='cpu', pin_memory=True)
+            return obj_cpu.copy_(obj, non_blocking=True)
+        if isinstance(obj, dict):
+            obj_cpu = type(obj)((k, self._to_cpu(v, cuda_devices)) for k, v in obj.items())
+            if hasattr(obj, '_metadata'):  # state dicts store module versions in this attribute
+                obj_cpu._metadata = obj._metadata  # pylint: disable=protected-access
+            return obj_cpu
+        if isinstance(obj, (list, tuple)):
+            return type(obj)(self._to_cpu(v, cuda_devices) for v in obj)
+        return obj
+
+    def save(self, obj: Any, path: str, **torch_save_kwargs) -> None:
+        """
+        Schedule saving ``obj`` to ``path``.
+
+        Parameters
+        ----------
+        obj : Tensor or dict or list or tuple
+            Object to save. Tensors inside of dicts, lists and tuples (e.g. a state dict) are
+            copied to the CPU; other objects are passed to :func:`torch.save` as they are.
+        path : str
+            File path. Relative paths are resolved w.r.t. the current working directory at the
+            time of this call.
+        **torch_save_kwargs : dict, optional
+            Keyword arguments passed to :func:`torch.save`, e.g.
+            ``_use_new_zipfile_serialization=False, pickle_protocol=4`` for the faster legacy
+            format, which can still be read by :func:`torch.load`.
+        """
+        self._raise_finished_exceptions()
+        cuda_devices = set()
+        obj_cpu = self._to_cpu(obj, cuda_devices)
+        events = []
+        for device in cuda_devices:
+            event = torch.cuda.Event()
+            event.record(torch.cuda.current_stream(device))
+            events.append(event)
+        path = os.path.abspath(path)
+
+        def _save():
+            for event in events:
+                event.synchronize()
+            torch.save(obj_cpu, path, **torch_save_kwargs)
+
+        self._futures.append(self._executor.submit(_save))
+
+    def _raise_finished_exceptions(self) -> None:
+        finished_futures = []
+        pending_futures = []
+        for future in self._futures:
+            (finished_futures if future.done() else pending_futures).append(future)
+        self._futures = pending_futures
+        for future in finished_futures:
+            future.result()
+
+    def wait(self) -> None:
+        """
+        Wait for all scheduled saves to finish, re-raising the first exception that occurred.
+        """
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Wait for all scheduled saves to finish and shut down the background thread.
+        """
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,5 +1,8 @@
 """
 Clone of gpytorch.utils.linear_cg also returning the residual.
+
+In contrast to the original, the matmul closure is only evaluated for the vectors that have not
+converged yet (i.e., for which the residual norm is not below ``stop_updating_after``).
 """
 import warnings
 import torch
@@ -149,7 +152,14 @@ def linear_cg(
     for k in range(n_iter):
         # Get next alpha
         # alpha_{k} = (residual_{k-1}^T precon_residual{k-1}) / (p_vec_{k-1}^T mat p_vec_{k-1})
-        mvms = matmul_closure(curr_conjugate_vec)
+        if not batch_shape and has_converged.any():
+            # the updates for converged vectors are cancelled anyways, so skip their matmuls
+            mvms = torch.zeros_like(curr_conjugate_vec)
+            is_active = ~has_converged[0]
+            if is_active.any():
+                mvms[:, is_active] = matmul_closure(curr_conjugate_vec[:, is_active])
+        else:
+            mvms = matmul_closure(curr_conjugate_vec)
         if precond:
             torch.mul(curr_conjugate_vec, mvms, out=mul_storage)
             torch.sum(mul_storage, -2, keepdim=True, out=alpha)
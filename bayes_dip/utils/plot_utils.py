@@ -1,29 +1,66 @@
 """
 Utilities for plotting.
 """
+import importlib.util
+from functools import lru_cache
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 from mpl_toolkits.axes_grid1.axes_divider import make_axes_locatable
 from mpl_toolkits.axes_grid1.inset_locator import InsetPosition
+try:
+    import fast_histogram
+    FAST_HISTOGRAM_AVAILABLE = True
+except ImportError:
+    FAST_HISTOGRAM_AVAILABLE = False
+# only check for numba here, the kernel module is imported when it is first needed
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
 
-def configure_matplotlib():
+# minimum data size for using the numba kernel, below which the JIT overhead is not worth it
+_NUMBA_HIST_MIN_SIZE = 1_000_000
+
+def configure_matplotlib(usetex: bool = False):
     """
     Configure common matplotlib settings that should be shared by plotting script.
+
+    Parameters
+    ----------
+    usetex : bool, optional
+        Whether to render text with LaTeX (loading ``amsmath``). This is a lot slower than
+        matplotlib's built-in mathtext, so it is meant for final figures only, see
+        :func:`configure_matplotlib_publication`. The default is ``False``.
     """
-    matplotlib.rc('text', usetex=True)
-    matplotlib.rc('text.latex', preamble='\\usepackage{amsmath}')
+    matplotlib.rc('text', usetex=usetex)
+    if usetex:
+        matplotlib.rc('text.latex', preamble='\\usepackage{amsmath}')
 
-def hex_to_rgb(value, alpha):
+def configure_matplotlib_publication():
     """
-    Convert a hex color string to a 4-tuple of float.
+    Configure matplotlib for final figures, i.e. call :func:`configure_matplotlib` with
+    ``usetex=True``.
     """
+    configure_matplotlib(usetex=True)
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(value, alpha):
     value = value.lstrip('#')
     lv = len(value)
-    out = tuple(int(value[i:i + lv // 3], 16) for i in range(0, lv, lv // 3))
+    if lv == 6:
+        v = int(value, 16)
+        out = ((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
+    else:
+        out = tuple(int(value[i:i + lv // 3], 16) for i in range(0, lv, lv // 3))
     out = [el / 255 for el in out] + [alpha]
     return tuple(out)
 
+def hex_to_rgb(value, alpha):
+    """
+    Convert a hex color string to a 4-tuple of float.
+
+    Results are cached, since the same few colors are usually converted repeatedly.
+    """
+    return _hex_to_rgb(value, float(alpha))
+
 DEFAULT_COLORS = {
     'abs_diff': '#e63946',
     'bayes_dip': '#5555ff',
@@ -33,6 +70,45 @@ DEFAULT_COLORS = {
     'mcdo': '#ee9b00',
 }
 
+def _to_flat_array(x):
+    # returns a view if possible, i.e. if x is a contiguous numpy array or cpu tensor
+    if hasattr(x, 'detach'):  # torch.Tensor
+        x = x.detach().cpu()
+    return np.ravel(np.asarray(x))
+
+# keyword arguments of ``ax.hist`` that are not supported by :func:`_hist_uniform_bins`
+_HIST_ONLY_KWARGS = {
+        'weights', 'cumulative', 'bottom', 'align', 'orientation', 'rwidth', 'log', 'stacked'}
+
+def _hist_uniform_bins(ax, x, bins=10, range=None, density=False, histtype='bar', **kwargs):
+    # uses fast_histogram if available, otherwise the numba kernel
+    # pylint: disable=redefined-builtin
+    if range is None:
+        # like ax.hist, ignore NaN values (and also infinite ones) for determining the range; the
+        # kernels below ignore them when counting, since they are outside of [lo, hi]
+        x_finite = x[np.isfinite(x)]
+        lo, hi = (np.min(x_finite), np.max(x_finite)) if x_finite.size > 0 else (0., 1.)
+    else:
+        lo, hi = range
+    if lo == hi:
+        # like numpy.histogram
+        lo, hi = lo - 0.5, hi + 0.5
+    if x.size == 0:
+        n = np.zeros(bins)
+    elif FAST_HISTOGRAM_AVAILABLE:
+        n = fast_histogram.histogram1d(x, bins=bins, range=(lo, hi))
+        # fast_histogram excludes the right edge, numpy.histogram includes it in the last bin
+        n[-1] += np.count_nonzero(x == hi)
+    else:
+        from ._hist_numba import uniform_hist1d  # pylint: disable=import-outside-toplevel
+        n = np.zeros(bins)
+        uniform_hist1d(x, float(lo), float(hi), bins, n)
+    bins = np.linspace(lo, hi, bins + 1)
+    if density and n.sum() > 0:  # all values might have been ignored
+        n = n / (n.sum() * np.diff(bins))
+    ax.stairs(n, bins, fill=(histtype == 'stepfilled'), **kwargs)
+    return n, bins
+
 def plot_hist(  # pylint: disable=too-many-arguments
         data, label_list, title=None, ax=None, xlim=None, ylim=None, yscale='log',
         remove_ticks=False, color_list=None, alpha_list=None, hist_kwargs=None,
@@ -40,6 +116,14 @@ def plot_hist(  # pylint: disable=too-many-arguments
     """
     Plot a set of histograms.
 
+    If the optional package ``fast_histogram`` is installed, histograms with uniform bins (i.e.
+    ``hist_kwargs['bins']`` being an int) of type ``'step'`` or ``'stepfilled'`` are computed with
+    it and drawn via :meth:`matplotlib.axes.Axes.stairs`, which is faster than
+    :meth:`matplotlib.axes.Axes.hist` for large data. If only ``numba`` is installed, a parallel
+    JIT-compiled kernel is used instead, for data with at least one million elements. Otherwise,
+    or if ``hist_kwargs`` contain options specific to :meth:`matplotlib.axes.Axes.hist` (like
+    ``'weights'``), the latter is used.
+
     Returns
     -------
     ax : :class:`matplotlib.axes.Axes`
@@ -73,14 +157,18 @@ def plot_hist(  # pylint: disable=too-many-arguments
     hist_kwargs_per_data.setdefault('edgecolor',
             [hex_to_rgb(color, alpha=1) for color in color_list])
     assert all(len(v) >= len(data) for v in hist_kwargs_per_data.values())
-    hist_kwargs_per_data_list = [
-            dict(zip(hist_kwargs_per_data.keys(), v)) for v in zip(*hist_kwargs_per_data.values())]
     n_list = []
     bins_list = []
-    for (el, hist_kwargs_overrides) in zip(data, hist_kwargs_per_data_list):
-        hist_kwargs_merged = hist_kwargs.copy()
-        hist_kwargs_merged.update(hist_kwargs_overrides)
-        n, bins, _ = ax.hist(np.asarray(el.flatten()), **hist_kwargs_merged)
+    for i, el in enumerate(data):
+        el = _to_flat_array(el)
+        hist_kwargs_merged = {**hist_kwargs, **{k: v[i] for k, v in hist_kwargs_per_data.items()}}
+        if ((FAST_HISTOGRAM_AVAILABLE or (NUMBA_AVAILABLE and el.size >= _NUMBA_HIST_MIN_SIZE))
+                and isinstance(hist_kwargs_merged['bins'], int)
+                and hist_kwargs_merged['histtype'] in ('step', 'stepfilled')
+                and not _HIST_ONLY_KWARGS.intersection(hist_kwargs_merged)):
+            n, bins = _hist_uniform_bins(ax, el, **hist_kwargs_merged)
+        else:
+            n, bins, _ = ax.hist(el, **hist_kwargs_merged)
         n_list.append(n)
         bins_list.append(bins)
     ax.set_title(title)
@@ -96,20 +184,41 @@ def plot_hist(  # pylint: disable=too-many-arguments
     ax.tick_params(labelbottom=not remove_ticks)
     return ax, n_list, bins_list
 
+def _update_image_data(image_handle, image, vmin=None, vmax=None):
+    # like ``ax.imshow(image, vmin=vmin, vmax=vmax)``, limits that are None are set from the data
+    image_handle.set_data(image)
+    image_handle.autoscale()
+    image_handle.set_clim(vmin, vmax)
+
 def plot_image(
         fig, ax, image,
         title='', vmin=None, vmax=None, cmap='gray', interpolation='none',
-        insets=None, insets_mark_in_orig=False, colorbar=False):
+        insets=None, insets_mark_in_orig=False, colorbar=False, im=None):
     """
     Show an image.
 
     A colorbar and insets can be added.
 
+    If ``im`` is passed (the object returned by a previous call with the same ``ax``), only the
+    image data, color limits and title are updated, which is much cheaper than re-creating the
+    artists for each frame; ``image`` must have the same shape as before, and the colorbar and
+    ticks are left as they are. Insets are passed to :func:`add_inset` like for a new plot, so in
+    order to update existing insets instead of adding new ones, each inset spec should contain
+    the inset axes returned by :func:`add_inset` as ``'axins'``.
+
     Returns
     -------
     im : :class:`matplotlib.image.AxesImage`
-        The object returned by ``ax.imshow(...)``.
+        The object returned by ``ax.imshow(...)``, or the passed ``im``.
     """
+    if im is not None:
+        _update_image_data(im, image, vmin=vmin, vmax=vmax)
+        ax.set_title(title)
+        for inset_spec in insets or []:
+            add_inset(
+                    fig, ax, image, **inset_spec, vmin=vmin, vmax=vmax, cmap=cmap,
+                    mark_in_orig=insets_mark_in_orig)
+        return im
     im = ax.imshow(image, vmin=vmin, vmax=vmax, cmap=cmap, interpolation=interpolation)
     ax.set_title(title)
     if insets:
@@ -142,15 +251,25 @@ def add_inset(
         fig, ax, image, axes_rect, rect,
         cmap='gray', vmin=None, vmax=None, interpolation='none',
         frame_color='#aa0000', frame_path=None, clip_path_closing=None, mark_in_orig=False,
-        origin='upper'):
+        origin='upper', axins=None):
     """
     Add an inset to an image plot.
 
+    If ``axins`` is passed (the inset axes returned by a previous call), only the data and color
+    limits of the inset image are updated from ``image``, ``rect``, ``vmin`` and ``vmax``; the
+    other arguments are ignored in this case.
+
     Returns
     -------
     axins : :class:`matplotlib.axes.Axes`
         Inset axes.
     """
+    if axins is not None:
+        inset_image_handle, = axins.get_images()
+        _update_image_data(
+                inset_image_handle, image[rect[0]:rect[0]+rect[2], rect[1]:rect[1]+rect[3]],
+                vmin=vmin, vmax=vmax)
+        return axins
     ip = InsetPosition(ax, axes_rect)
     axins = matplotlib.axes.Axes(fig, [0., 0., 1., 1.])
     axins.set_axes_locator(ip)
@@ -168,14 +287,19 @@ def add_inset(
     if frame_path is None:
         frame_path = [[0., 0.], [1., 0.], [0., 1.], [1., 1]]
     if frame_path:
-        frame_path_closed = frame_path + (clip_path_closing if clip_path_closing is not None else [])
+        frame_path_closed = np.asarray(
+                frame_path + (clip_path_closing if clip_path_closing is not None else []),
+                dtype=np.float64)
         if mark_in_orig:
-            scalex, scaley = rect[3], rect[2]
-            offsetx, offsety = rect[1], (image.shape[0]-(rect[0]+rect[2]) if origin == 'upper' else rect[0])
-            y_trans = matplotlib.transforms.Affine2D().scale(1., -1.).translate(0., image.shape[0]-1) if origin == 'upper' else matplotlib.transforms.IdentityTransform()
-            trans_data = matplotlib.transforms.Affine2D().scale(scalex, scaley).translate(offsetx, offsety) + y_trans + ax.transData
-            x, y = [*zip(*(frame_path_closed + [frame_path_closed[0]]))]
-            ax.plot(x, y, transform=trans_data, color=frame_color, linestyle='dashed', linewidth=1.)
+            scale = np.array([rect[3], rect[2]])
+            offset = np.array(
+                    [rect[1], (image.shape[0]-(rect[0]+rect[2]) if origin == 'upper' else rect[0])])
+            # map from inset axes coordinates to data coordinates of ax
+            frame_path_orig = np.concatenate(
+                    [frame_path_closed, frame_path_closed[:1]]) * scale + offset
+            if origin == 'upper':
+                frame_path_orig[:, 1] = image.shape[0] - 1 - frame_path_orig[:, 1]
+            ax.plot(*frame_path_orig.T, color=frame_color, linestyle='dashed', linewidth=1.)
         axins.plot(
                 *np.array(frame_path).T,
                 transform=axins.transAxes,
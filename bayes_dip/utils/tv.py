@@ -29,6 +29,21 @@ def tv_loss(x: Tensor) -> Tensor:
     # torch.sum(dh[..., :-1, :] + dw[..., :, :-1]) instead
     return torch.sum(dh) + torch.sum(dw)
 
+@torch.jit.script
+def _batch_tv_grad(x: Tensor) -> Tensor:
+    # scripted to avoid Python overhead (this is called in every step of weights_linearization)
+    batch_size = x.shape[0]
+    sign_diff_x = torch.sign(torch.diff(-x, n=1, dim=-1))
+    pad = torch.zeros((batch_size, 1, x.shape[-2], 1), dtype=x.dtype, device=x.device)
+    diff_x_pad = torch.cat([pad, sign_diff_x, pad], dim=-1)
+    grad_tv_x = torch.diff(diff_x_pad, n=1, dim=-1)
+    sign_diff_y = torch.sign(torch.diff(-x, n=1, dim=-2))
+    pad = torch.zeros((batch_size, 1, 1, x.shape[-1]), dtype=x.dtype, device=x.device)
+    diff_y_pad = torch.cat([pad, sign_diff_y, pad], dim=-2)
+    grad_tv_y = torch.diff(diff_y_pad, n=1, dim=-2)
+
+    return grad_tv_x + grad_tv_y
+
 def batch_tv_grad(x: Tensor) -> Tensor:
     """
     Gradient of :func:`tv_loss` for 4D tensors.
@@ -44,14 +59,4 @@ def batch_tv_grad(x: Tensor) -> Tensor:
         Gradient of the TV loss w.r.t. the input ``x``. Has the same shape as ``x``.
     """
     assert x.ndim == 4 and x.shape[1] == 1
-    batch_size = x.shape[0]
-    sign_diff_x = torch.sign(torch.diff(-x, n=1, dim=-1))
-    pad = torch.zeros((batch_size, 1, x.shape[-2], 1), device = x.device)
-    diff_x_pad = torch.cat([pad, sign_diff_x, pad], dim=-1)
-    grad_tv_x = torch.diff(diff_x_pad, n=1, dim=-1)
-    sign_diff_y = torch.sign(torch.diff(-x, n=1, dim=-2))
-    pad = torch.zeros((batch_size, 1, 1, x.shape[-1]), device = x.device)
-    diff_y_pad = torch.cat([pad, sign_diff_y, pad], dim=-2)
-    grad_tv_y = torch.diff(diff_y_pad, n=1, dim=-2)
-
-    return grad_tv_x + grad_tv_y
+    return _batch_tv_grad(x)
@@ -135,6 +135,7 @@ def cg(
         precon_closure: Optional[Callable] = None,
         max_niter: int = 10,
         rtol: float = 1e-6,
+        stop_updating_after: float = 1e-10,
         use_log_re_variant: bool = False,
         ignore_numerical_warning: bool = False,
         ) -> Tuple[Tensor, Tensor]:
@@ -159,6 +160,11 @@ def cg(
     rtol : float, optional
         Tolerance at which to stop early (before ``max_niter``), see ``tolerance`` argument to
         :func:`linear_cg`. The default is ``1e-6``.
+    stop_updating_after : float, optional
+        Residual norm below which a column of ``v`` is considered converged, see
+        ``stop_updating_after`` argument to :func:`linear_cg`. Converged columns are no longer
+        updated and excluded from the calls to ``closure`` (unless ``use_log_re_variant``).
+        The default is ``1e-10``.
     use_log_re_variant : bool, optional
         Whether to use the low precision arithmetic variant by Maddox et al.,
         :meth:`linear_log_cg_re`. The default is ``False``.
@@ -182,7 +188,7 @@ def cg(
 
     # pylint: disable=unbalanced-tuple-unpacking
     solve, residual_norm = cg_func(closure, v, tolerance=rtol,
-                eps=1e-10, stop_updating_after=1e-10, max_iter=max_niter,
+                eps=1e-10, stop_updating_after=stop_updating_after, max_iter=max_niter,
                 max_tridiag_iter=max_niter-1, preconditioner=precon_closure,
             )
 
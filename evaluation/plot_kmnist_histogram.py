@@ -4,7 +4,7 @@ import argparse
 import torch
 from omegaconf import OmegaConf
 from bayes_dip.utils.evaluation_utils import get_abs_diff, get_stddev, translate_path
-from bayes_dip.utils.plot_utils import configure_matplotlib, plot_hist
+from bayes_dip.utils.plot_utils import configure_matplotlib_publication, plot_hist
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--runs_file', type=str, default='runs_kmnist_exact_density.yaml', help='path of yaml file containing hydra output directory names')
@@ -78,7 +78,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 yscale = 'linear' if args.do_not_use_log_yscale else 'log'
 
@@ -10,7 +10,7 @@ from bayes_dip.utils.utils import PSNR, SSIM
 from bayes_dip.utils.evaluation_utils import (
         get_abs_diff, get_density_data, get_recon, get_ground_truth, get_observation, get_stddev, translate_path)
 from bayes_dip.utils.plot_utils import (
-        DEFAULT_COLORS, configure_matplotlib, plot_hist, plot_image, add_metrics)
+        DEFAULT_COLORS, configure_matplotlib_publication, plot_hist, plot_image, add_metrics)
 from baselines.evaluation_utils import compute_mcdo_reconstruction, get_mcdo_density_data, get_mcdo_stddev
 
 parser = argparse.ArgumentParser()
@@ -128,7 +128,7 @@ if args.save_data_to:
     print(f'saving data to {args.save_data_to}')
     torch.save(data, args.save_data_to)
 
-configure_matplotlib()
+configure_matplotlib_publication()
 fig, axs = plt.subplots(2, 8, figsize=(14, 4.5), gridspec_kw={
     'width_ratios': [1., 0.05, 1., 1., 0.05, 1., 0.45, 1.],  # includes spacer columns
     'wspace': 0.01, 'hspace': 0.2})
@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 from bayes_dip.utils.evaluation_utils import (
         get_density_data, compute_log_prob_for_patch_size_from_cov, get_ground_truth, get_recon,
         translate_path)
-from bayes_dip.utils.plot_utils import configure_matplotlib
+from bayes_dip.utils.plot_utils import configure_matplotlib_publication
 
 def float_or_none(v):
     return None if v == 'None' else float(v)
@@ -114,7 +114,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 fig, axs = plt.subplots(1, args.num_subplots, figsize=(4 * args.num_subplots, 3))
 axs = np.atleast_1d(axs)
@@ -11,7 +11,7 @@ from bayes_dip.utils import tv_loss
 from bayes_dip.probabilistic_models import (
         get_default_unet_gaussian_prior_dicts, ParameterCov, MatmulNeuralBasisExpansion, GPprior)
 from bayes_dip.utils.evaluation_utils import get_nn_model, translate_path
-from bayes_dip.utils.plot_utils import DEFAULT_COLORS, configure_matplotlib
+from bayes_dip.utils.plot_utils import DEFAULT_COLORS, configure_matplotlib_publication
 
 
 # it is recommended to run this script with CUDA being available (50 images take *long* on CPU);
@@ -40,7 +40,7 @@ parser.add_argument('--num_images', type=int, default=50)
 parser.add_argument('--image2highlight', type=int, default=4)
 
 args = parser.parse_args()
-configure_matplotlib()
+configure_matplotlib_publication()
 
 experiment_paths = {
         'outputs_path': args.experiments_outputs_path,
@@ -5,7 +5,7 @@ import numpy as np
 import pickle
 import matplotlib.pyplot as plt
 from bayes_dip.utils.evaluation_utils import get_image_cov
-from bayes_dip.utils.plot_utils import configure_matplotlib, plot_hist, DEFAULT_COLORS
+from bayes_dip.utils.plot_utils import configure_matplotlib_publication, plot_hist, DEFAULT_COLORS
 from bayes_dip.data.datasets import get_kmnist_testset
 from bayes_dip.utils import normalize
 
@@ -139,7 +139,7 @@ if args.save_data_to:
     torch.save(
         {'data': data, 'data_lin_dip': data_lin_dip},  args.save_data_to)
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 fig, axs = plt.subplots(1, 9, figsize=(16, 2), gridspec_kw={
     'width_ratios': [1., 0.25, 1., 0.05, 1., 1., 1., 1., 1.],  # includes spacer columns
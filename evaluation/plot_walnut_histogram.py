@@ -4,7 +4,7 @@ import argparse
 from omegaconf import OmegaConf
 import torch
 from bayes_dip.utils.evaluation_utils import get_abs_diff, get_stddev, translate_path
-from bayes_dip.utils.plot_utils import configure_matplotlib, plot_hist, DEFAULT_COLORS
+from bayes_dip.utils.plot_utils import configure_matplotlib_publication, plot_hist, DEFAULT_COLORS
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--runs_file', type=str, default='runs_walnut_sample_based_density.yaml', help='path of yaml file containing hydra output directory names')
@@ -76,7 +76,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 
 abs_diff = data['abs_diff']
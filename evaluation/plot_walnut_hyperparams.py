@@ -5,7 +5,7 @@ import yaml
 import torch
 import numpy as np
 import matplotlib.pyplot as plt
-from bayes_dip.utils.plot_utils import DEFAULT_COLORS, configure_matplotlib
+from bayes_dip.utils.plot_utils import DEFAULT_COLORS, configure_matplotlib_publication
 from bayes_dip.utils.evaluation_utils import extract_tensorboard_scalars, find_single_log_file, translate_path
 
 parser = argparse.ArgumentParser()
@@ -59,7 +59,7 @@ if args.save_data_to:
     print(f'saving data to {args.save_data_to}')
     torch.save(data, args.save_data_to)
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 all_tags = [
         k[:-len('_scalars')] for k in data['scalars'].keys() if k.endswith('_scalars') and (
@@ -11,7 +11,7 @@ from bayes_dip.utils.utils import PSNR, SSIM
 from bayes_dip.utils.evaluation_utils import (
         get_abs_diff, get_density_data, get_recon, get_ground_truth, get_stddev, restrict_sample_based_density_data_to_new_patch_idx_list, translate_path)
 from bayes_dip.utils.plot_utils import (
-        configure_matplotlib,  plot_image, add_inner_rect, add_metrics,
+        configure_matplotlib_publication,  plot_image, add_inner_rect, add_metrics,
         )
 from baselines.evaluation_utils import compute_mcdo_reconstruction, get_mcdo_density_data, get_mcdo_stddev
 
@@ -188,7 +188,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 
 fig, axs = plt.subplots(2, 6, figsize=(16, 7.25), gridspec_kw={
@@ -6,7 +6,7 @@ import matplotlib.pyplot as plt
 from omegaconf import OmegaConf
 from bayes_dip.data.datasets.walnut import get_walnut_2d_inner_part_defined_by_patch_size
 from bayes_dip.utils.evaluation_utils import get_abs_diff, get_ground_truth, get_stddev, translate_path
-from bayes_dip.utils.plot_utils import configure_matplotlib, plot_image, add_inset
+from bayes_dip.utils.plot_utils import configure_matplotlib_publication, plot_image, add_inset
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--runs_file', type=str, default='runs_walnut_sample_based_density.yaml', help='path of yaml file containing hydra output directory names')
@@ -80,7 +80,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 
 fig, ax = plt.subplots(figsize=(4.5, 2.25), gridspec_kw={'left': 0., 'right': 0.5})
@@ -12,7 +12,7 @@ from bayes_dip.data.datasets.walnut import get_walnut_2d_inner_part_defined_by_p
 from bayes_dip.utils.evaluation_utils import (
         get_abs_diff, get_density_data, get_recon, get_ground_truth, get_stddev, restrict_sample_based_density_data_to_new_patch_idx_list, translate_path)
 from bayes_dip.utils.plot_utils import (
-        DEFAULT_COLORS, configure_matplotlib, plot_hist, plot_qq)
+        DEFAULT_COLORS, configure_matplotlib_publication, plot_hist, plot_qq)
 from baselines.evaluation_utils import compute_mcdo_reconstruction, get_mcdo_density_data, get_mcdo_stddev
 
 parser = argparse.ArgumentParser()
@@ -212,7 +212,7 @@ if args.save_data_to:
     torch.save(data, args.save_data_to)
 
 
-configure_matplotlib()
+configure_matplotlib_publication()
 
 fig, axs = plt.subplots(2, 2, figsize=(6, 6), gridspec_kw={
     'width_ratios': [1., 1.],  # includes spacer columns
@@ -43,6 +43,7 @@ def coordinator(cfg : DictConfig) -> None:
         observation = observation.to(dtype=dtype, device=device)
         filtbackproj = filtbackproj.to(dtype=dtype, device=device)
         ground_truth = ground_truth.to(dtype=dtype, device=device)
+        ground_truth_np = ground_truth[0, 0].cpu().numpy()  # for the metrics
 
         net_kwargs = {
                 'scales': cfg.dip.net.scales,
@@ -83,8 +84,9 @@ def coordinator(cfg : DictConfig) -> None:
             )
 
         print(f'DIP reconstruction of sample {i:d}')
-        print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-        print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+        recon_np = recon[0, 0].cpu().numpy()
+        print('PSNR:', PSNR(recon_np, ground_truth_np))
+        print('SSIM:', SSIM(recon_np, ground_truth_np))
 
 if __name__ == '__main__':
     coordinator()  # pylint: disable=no-value-for-parameter
@@ -32,6 +32,9 @@ def coordinator(cfg : DictConfig) -> None:
             cfg, ray_trafo, fold=cfg.dataset.fold, use_fixed_seeds_starting_from=cfg.seed,
             device=device)
 
+    # convert the config sections used in the loop only once
+    scale_kwargs = OmegaConf.to_object(cfg.priors.gprior.scale)
+
     for i, data_sample in enumerate(islice(DataLoader(dataset), cfg.num_images)):
         if i < cfg.get('skip_first_images', 0):
             continue
@@ -47,6 +50,7 @@ def coordinator(cfg : DictConfig) -> None:
         observation = observation.to(dtype=dtype, device=device)
         filtbackproj = filtbackproj.to(dtype=dtype, device=device)
         ground_truth = ground_truth.to(dtype=dtype, device=device)
+        ground_truth_np = ground_truth[0, 0].cpu().numpy()  # for the metrics
 
         net_kwargs = {
                 'scales': cfg.dip.net.scales,
@@ -64,8 +68,9 @@ def coordinator(cfg : DictConfig) -> None:
             recon = reconstructor.nn_model(filtbackproj)  # pylint: disable=not-callable
 
         print(f'DIP reconstruction of sample {i:d}')
-        print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-        print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+        recon_np = recon[0, 0].cpu().numpy()
+        print('PSNR:', PSNR(recon_np, ground_truth_np))
+        print('SSIM:', SSIM(recon_np, ground_truth_np))
 
         prior_assignment_dict, hyperparams_init_dict = get_default_unet_gaussian_prior_dicts(
                 reconstructor.nn_model)
@@ -82,7 +87,7 @@ def coordinator(cfg : DictConfig) -> None:
                 nn_out_shape=filtbackproj.shape,
                 use_gprior=cfg.priors.use_gprior,
                 trafo=ray_trafo,
-                scale_kwargs=OmegaConf.to_object(cfg.priors.gprior.scale),
+                scale_kwargs=scale_kwargs,
                 )
         image_cov = ImageCov(
                 parameter_cov=parameter_cov,
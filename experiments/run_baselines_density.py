@@ -48,6 +48,7 @@ def coordinator(cfg : DictConfig) -> None:
         observation = observation.to(dtype=dtype, device=device)
         filtbackproj = filtbackproj.to(dtype=dtype, device=device)
         ground_truth = ground_truth.to(dtype=dtype, device=device)
+        ground_truth_np = ground_truth[0, 0].cpu().numpy()  # for the metrics
 
         net_kwargs = {
                 'scales': cfg.dip.net.scales,
@@ -72,8 +73,9 @@ def coordinator(cfg : DictConfig) -> None:
                 recon = reconstructor.nn_model(filtbackproj)  # pylint: disable=not-callable
 
                 print(f'DIP reconstruction of sample {i:d}')
-                print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-                print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+                recon_np = recon[0, 0].cpu().numpy()
+                print('PSNR:', PSNR(recon_np, ground_truth_np))
+                print('SSIM:', SSIM(recon_np, ground_truth_np))
 
                 if cfg.baseline.load_log_noise_variance:
                     log_noise_variance = torch.load(
@@ -92,8 +94,9 @@ def coordinator(cfg : DictConfig) -> None:
                 recon = reconstructor.nn_model(filtbackproj)  # pylint: disable=not-callable
 
             print(f'DIP reconstruction of sample {i:d}')
-            print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-            print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+            recon_np = recon[0, 0].cpu().numpy()
+            print('PSNR:', PSNR(recon_np, ground_truth_np))
+            print('SSIM:', SSIM(recon_np, ground_truth_np))
 
         if log_noise_variance is None:
             log_noise_variance = torch.tensor(1).log()
@@ -115,8 +118,9 @@ def coordinator(cfg : DictConfig) -> None:
             mean_recon = samples.mean(dim=0, keepdim=True)
 
             print(f'DIP mean reconstruction of sample {i:d}')
-            print('PSNR:', PSNR(mean_recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-            print('SSIM:', SSIM(mean_recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+            mean_recon_np = mean_recon[0, 0].cpu().numpy()
+            print('PSNR:', PSNR(mean_recon_np, ground_truth_np))
+            print('SSIM:', SSIM(mean_recon_np, ground_truth_np))
 
             log_prob_kernel_density = None
             if cfg.dataset.name in ['kmnist']:
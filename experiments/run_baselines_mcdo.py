@@ -45,6 +45,7 @@ def coordinator(cfg : DictConfig) -> None:
         observation = observation.to(dtype=dtype, device=device)
         filtbackproj = filtbackproj.to(dtype=dtype, device=device)
         ground_truth = ground_truth.to(dtype=dtype, device=device)
+        ground_truth_np = ground_truth[0, 0].cpu().numpy()  # for the metrics
 
         net_kwargs = {
                 'scales': cfg.dip.net.scales,
@@ -92,8 +93,9 @@ def coordinator(cfg : DictConfig) -> None:
                 f'mcdo_dip_model_{i}.pt')
 
         print(f'DIP reconstruction of sample {i:d}')
-        print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-        print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+        recon_np = recon[0, 0].cpu().numpy()
+        print('PSNR:', PSNR(recon_np, ground_truth_np))
+        print('SSIM:', SSIM(recon_np, ground_truth_np))
 
         samples = sample_from_bayesianized_model(
                     reconstructor.nn_model,
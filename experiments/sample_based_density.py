@@ -53,6 +53,10 @@ def coordinator(cfg : DictConfig) -> None:
             cfg, ray_trafo, fold=cfg.dataset.fold, use_fixed_seeds_starting_from=cfg.seed,
             device=device)
 
+    # convert the config sections used in the loop only once
+    scale_kwargs = OmegaConf.to_object(cfg.priors.gprior.scale)
+    cg_kwargs = OmegaConf.to_object(cfg.inference.sampling.cg_kwargs)
+
     for i, data_sample in enumerate(islice(DataLoader(dataset), cfg.num_images)):
         if i < cfg.get('skip_first_images', 0):
             continue
@@ -68,6 +72,7 @@ def coordinator(cfg : DictConfig) -> None:
         observation = observation.to(dtype=dtype, device=device)
         filtbackproj = filtbackproj.to(dtype=dtype, device=device)
         ground_truth = ground_truth.to(dtype=dtype, device=device)
+        ground_truth_np = ground_truth[0, 0].cpu().numpy()  # for the metrics
 
         net_kwargs = {
                 'scales': cfg.dip.net.scales,
@@ -85,8 +90,9 @@ def coordinator(cfg : DictConfig) -> None:
             recon = reconstructor.nn_model(filtbackproj)  # pylint: disable=not-callable
 
         print(f'DIP reconstruction of sample {i:d}')
-        print('PSNR:', PSNR(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
-        print('SSIM:', SSIM(recon[0, 0].cpu().numpy(), ground_truth[0, 0].cpu().numpy()))
+        recon_np = recon[0, 0].cpu().numpy()
+        print('PSNR:', PSNR(recon_np, ground_truth_np))
+        print('SSIM:', SSIM(recon_np, ground_truth_np))
 
         prior_assignment_dict, hyperparams_init_dict = (
                 get_default_unet_gaussian_prior_dicts(reconstructor.nn_model)
@@ -105,7 +111,7 @@ def coordinator(cfg : DictConfig) -> None:
                 nn_out_shape=filtbackproj.shape,
                 use_gprior=cfg.priors.use_gprior,
                 trafo=ray_trafo,
-                scale_kwargs=OmegaConf.to_object(cfg.priors.gprior.scale)
+                scale_kwargs=scale_kwargs
         )
         if cfg.inference.use_low_rank_neural_basis_expansion:
             if cfg.inference.load_samples_from_path is None:
@@ -166,7 +172,7 @@ def coordinator(cfg : DictConfig) -> None:
             sample_kwargs = {
                 'batch_size': cfg.inference.sampling.batch_size,
                 'use_conj_grad_inv': cfg.inference.sampling.use_conj_grad_inv,
-                'cg_kwargs': OmegaConf.to_object(cfg.inference.sampling.cg_kwargs),
+                'cg_kwargs': cg_kwargs.copy(),  # a precon_closure may be added
             }
             update_kwargs = {'batch_size': cfg.inference.sampling.cg_preconditioner.batch_size}
             if cfg.inference.sampling.use_conj_grad_inv:
@@ -285,3 +285,28 @@ def test_ichol_approx_diag_preconditioner(linear_system, ichol_approx_diag_preco
         cg_solution = cg_solution[:, 0]
         rel_residual_norm = _residual_norm(mat, noise, rhs, cg_solution) / zero_residual_norm
         assert rel_residual_norm < max_rel_residual_norm
+
+def test_cg_skips_converged_vectors(linear_system):
+    (mat, noise), rhs = linear_system
+
+    num_cols_per_call = []
+    def closure(v):
+        num_cols_per_call.append(v.shape[1])
+        return mat @ v + noise * v
+
+    # second column is zero, so it has converged from the start
+    rhs_mat = torch.stack([rhs, torch.zeros_like(rhs)], dim=1)
+
+    cg_solution, _ = cg(
+            closure, rhs_mat, precon_closure=lambda v: v.clone(),
+            use_log_re_variant=False,  # Maddox often produces nan
+            )
+    ref_cg_solution, _ = cg(
+            lambda v: mat @ v + noise * v, rhs[:, None], precon_closure=lambda v: v.clone(),
+            use_log_re_variant=False,  # Maddox often produces nan
+            )
+
+    assert torch.allclose(cg_solution[:, 0], ref_cg_solution[:, 0])
+    assert torch.all(cg_solution[:, 1] == 0.)
+    # only the initial residual is computed with both columns
+    assert all(num_cols == 1 for num_cols in num_cols_per_call[1:])
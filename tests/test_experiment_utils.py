@@ -0,0 +1,71 @@
+"""
+Tests for :mod:`bayes_dip.utils.experiment_utils`.
+"""
+
+import os
+import pytest
+import torch
+from torch import nn
+from bayes_dip.utils.experiment_utils import AsyncSaver
+
+def test_async_saver(tmp_path):
+    """
+    Test that :class:`AsyncSaver` writes copies of the objects passed to :meth:`AsyncSaver.save`,
+    i.e. that modifying the originals afterwards does not change the saved data.
+    """
+    torch.random.manual_seed(1)
+    state_dict = nn.Sequential(nn.Conv2d(1, 2, 3), nn.BatchNorm2d(2)).state_dict()
+    nested_dict = {'model': state_dict, 'step': 3, 'values': torch.rand(4)}
+    tensor_list = [torch.rand(2, 3), torch.rand(5)]
+    tensor = torch.rand(1, 1, 4, 4)
+    expected_nested_dict = {
+            'model': {k: v.clone() for k, v in state_dict.items()},
+            'values': nested_dict['values'].clone()}
+    expected_tensor_list = [v.clone() for v in tensor_list]
+    expected_tensor = tensor.clone()
+
+    saver = AsyncSaver()
+    saver.save(nested_dict, os.path.join(tmp_path, 'nested_dict.pt'),
+            _use_new_zipfile_serialization=False, pickle_protocol=4)
+    saver.save(tensor_list, os.path.join(tmp_path, 'tensor_list.pt'))
+    saver.save(tensor, os.path.join(tmp_path, 'tensor.pt'))
+    # modify the originals before the files are (necessarily) written
+    for v in state_dict.values():
+        v.add_(1)
+    nested_dict['values'].zero_()
+    for v in tensor_list:
+        v.zero_()
+    tensor.zero_()
+    saver.close()
+
+    loaded_nested_dict = torch.load(os.path.join(tmp_path, 'nested_dict.pt'))
+    assert loaded_nested_dict['step'] == 3
+    assert torch.equal(loaded_nested_dict['values'], expected_nested_dict['values'])
+    assert loaded_nested_dict['model'].keys() == expected_nested_dict['model'].keys()
+    for k, v in expected_nested_dict['model'].items():
+        assert torch.equal(loaded_nested_dict['model'][k], v)
+    assert (loaded_nested_dict['model']._metadata  # pylint: disable=protected-access
+            == state_dict._metadata)  # pylint: disable=protected-access
+    # the saved state dict can be loaded into a module again
+    nn.Sequential(nn.Conv2d(1, 2, 3), nn.BatchNorm2d(2)).load_state_dict(
+            loaded_nested_dict['model'])
+
+    loaded_tensor_list = torch.load(os.path.join(tmp_path, 'tensor_list.pt'))
+    assert isinstance(loaded_tensor_list, list)
+    assert len(loaded_tensor_list) == len(expected_tensor_list)
+    for v_loaded, v in zip(loaded_tensor_list, expected_tensor_list):
+        assert torch.equal(v_loaded, v)
+
+    assert torch.equal(torch.load(os.path.join(tmp_path, 'tensor.pt')), expected_tensor)
+
+def test_async_saver_exception(tmp_path):
+    """
+    Test that an exception raised while writing in the background thread is re-raised by
+    :meth:`AsyncSaver.wait`, and that the saver can be used further afterwards.
+    """
+    with AsyncSaver() as saver:
+        saver.save(torch.zeros(1), os.path.join(tmp_path, 'missing_dir', 'tensor.pt'))
+        with pytest.raises(RuntimeError):
+            saver.wait()
+        saver.save(torch.ones(1), os.path.join(tmp_path, 'tensor.pt'))
+    assert torch.equal(torch.load(os.path.join(tmp_path, 'tensor.pt')), torch.ones(1))
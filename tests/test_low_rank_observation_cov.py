@@ -0,0 +1,160 @@
+"""
+Tests for :class:`bayes_dip.probabilistic_models.LowRankObservationCov`.
+"""
+
+import pytest
+import torch
+import numpy as np
+from bayes_dip.data import MatmulRayTrafo
+from bayes_dip.dip import DeepImagePriorReconstructor
+from bayes_dip.probabilistic_models import (
+        get_default_unet_gaussian_prior_dicts, ParameterCov, NeuralBasisExpansion, ImageCov,
+        LowRankObservationCov)
+
+def _get_ray_trafo_and_image_cov(device='cpu'):
+    torch.random.manual_seed(1)
+    im_shape = (16, 16)
+    obs_shape = (6, 23)
+    matrix = torch.rand(np.prod(obs_shape), np.prod(im_shape))
+    ray_trafo = MatmulRayTrafo(im_shape=im_shape, obs_shape=obs_shape, matrix=matrix).to(
+            device=device)
+    net_input = torch.rand(1, 1, *im_shape, device=device)
+    net_kwargs = {
+                'scales': 2,
+                'channels': [4, 4],
+                'skip_channels': [0, 1],
+                'use_norm': False,
+                'use_sigmoid': True,
+                'sigmoid_saturation_thresh': 15}
+    reconstructor = DeepImagePriorReconstructor(
+            ray_trafo, torch_manual_seed=1, device=device, net_kwargs=net_kwargs)
+    prior_assignment_dict, hyperparams_init_dict = get_default_unet_gaussian_prior_dicts(
+            reconstructor.nn_model)
+    parameter_cov = ParameterCov(
+            reconstructor.nn_model,
+            prior_assignment_dict,
+            hyperparams_init_dict,
+            device=device
+    )
+    neural_basis_expansion = NeuralBasisExpansion(
+            nn_model=reconstructor.nn_model,
+            nn_input=net_input,
+            ordered_nn_params=parameter_cov.ordered_nn_params,
+            nn_out_shape=net_input.shape,
+    )
+    image_cov = ImageCov(
+            parameter_cov=parameter_cov,
+            neural_basis_expansion=neural_basis_expansion
+    )
+    return ray_trafo, image_cov
+
+@pytest.fixture(scope='session')
+def ray_trafo_and_image_cov():
+    return _get_ray_trafo_and_image_cov()
+
+def _get_low_rank_observation_cov(ray_trafo, image_cov, seed=1, device='cpu', **kwargs):
+    torch.random.manual_seed(seed)
+    return LowRankObservationCov(
+            trafo=ray_trafo,
+            image_cov=image_cov,
+            low_rank_rank_dim=20,
+            oversampling_param=10,
+            requires_grad=False,
+            device=device,
+            **kwargs)
+
+def _low_rank_term(low_rank_observation_cov):
+    U, L = low_rank_observation_cov.U, low_rank_observation_cov.L
+    return U @ (L[:, None] * U.T)
+
+def _rel_error(a, b):
+    return (torch.linalg.norm(a - b) / torch.linalg.norm(b)).item()
+
+def test_auto_batch_size_cpu(ray_trafo_and_image_cov):
+    """
+    Test that ``batch_size='auto'`` falls back to a valid batch size on CPU, and that the basis
+    matches the one obtained with a fixed batch size.
+    """
+    ray_trafo, image_cov = ray_trafo_and_image_cov
+
+    low_rank_observation_cov_auto = _get_low_rank_observation_cov(
+            ray_trafo, image_cov, batch_size='auto')
+    num_random_vectors = low_rank_observation_cov_auto.random_matrix.shape[0]
+    # pylint: disable=protected-access
+    auto_batch_size = low_rank_observation_cov_auto._get_auto_batch_size()
+    assert isinstance(auto_batch_size, int)
+    assert 1 <= auto_batch_size <= num_random_vectors
+
+    # 30 random vectors are divisible by 5, so both use the same random matrix
+    low_rank_observation_cov_fixed = _get_low_rank_observation_cov(
+            ray_trafo, image_cov, batch_size=5)
+    assert torch.equal(
+            low_rank_observation_cov_auto.random_matrix,
+            low_rank_observation_cov_fixed.random_matrix)
+    # the batch size only changes the rounding errors
+    assert _rel_error(low_rank_observation_cov_auto.L, low_rank_observation_cov_fixed.L) < 1e-3
+    assert _rel_error(
+            _low_rank_term(low_rank_observation_cov_auto),
+            _low_rank_term(low_rank_observation_cov_fixed)) < 1e-3
+
+def test_random_matrix_dtype(ray_trafo_and_image_cov):
+    """
+    Test that a random matrix stored in ``torch.bfloat16`` is cast to the default dtype before it
+    is used, and that the resulting basis matches the one for the same random matrix stored in the
+    default dtype.
+    """
+    # pylint: disable=protected-access
+    ray_trafo, image_cov = ray_trafo_and_image_cov
+
+    low_rank_observation_cov_bf16 = _get_low_rank_observation_cov(
+            ray_trafo, image_cov, random_matrix_dtype=torch.bfloat16, batch_size=5)
+    assert low_rank_observation_cov_bf16.random_matrix.dtype == torch.bfloat16
+
+    input_dtypes = []
+    orig_low_rank_term_batch = low_rank_observation_cov_bf16._low_rank_term_batch
+    def low_rank_term_batch_recording_dtype(rnd_vect):
+        input_dtypes.append(rnd_vect.dtype)
+        return orig_low_rank_term_batch(rnd_vect)
+    low_rank_observation_cov_bf16._low_rank_term_batch = low_rank_term_batch_recording_dtype
+    try:
+        low_rank_observation_cov_bf16.update(batch_size=5)
+    finally:
+        del low_rank_observation_cov_bf16._low_rank_term_batch
+    assert input_dtypes and all(dtype == torch.get_default_dtype() for dtype in input_dtypes)
+    assert low_rank_observation_cov_bf16.U.dtype == torch.get_default_dtype()
+    assert low_rank_observation_cov_bf16.L.dtype == torch.get_default_dtype()
+
+    # same (rounded) random numbers, stored in the default dtype
+    low_rank_observation_cov = _get_low_rank_observation_cov(ray_trafo, image_cov, batch_size=5)
+    low_rank_observation_cov.random_matrix = low_rank_observation_cov_bf16.random_matrix.to(
+            dtype=torch.get_default_dtype())
+    low_rank_observation_cov.update(batch_size=5)
+    assert _rel_error(low_rank_observation_cov_bf16.L, low_rank_observation_cov.L) < 1e-3
+    assert _rel_error(
+            _low_rank_term(low_rank_observation_cov_bf16),
+            _low_rank_term(low_rank_observation_cov)) < 1e-3
+
+@pytest.mark.parametrize('device', [
+        'cpu',
+        pytest.param('cuda', marks=pytest.mark.skipif(
+                not torch.cuda.is_available(), reason='requires CUDA'))])
+def test_qr_on_cpu(device):
+    """
+    Test that successive QR computations on CPU (staged via reused pinned buffers if on CUDA) with
+    changing and repeated shapes give the same results as :func:`torch.linalg.qr`.
+    """
+    # pylint: disable=protected-access
+    ray_trafo, image_cov = _get_ray_trafo_and_image_cov(device=device)
+    low_rank_observation_cov = _get_low_rank_observation_cov(
+            ray_trafo, image_cov, device=device, batch_size=5)
+
+    torch.random.manual_seed(2)
+    obs_numel = np.prod(ray_trafo.obs_shape)
+    # the third call reuses the buffers of the second one
+    for num_cols in [30, 20, 20]:
+        v = torch.randn(obs_numel, num_cols, device=device)
+        Q = low_rank_observation_cov._qr_on_cpu(v)
+        assert Q.device == v.device
+        Q_ref, R_ref = torch.linalg.qr(v.cpu())
+        assert torch.equal(Q.cpu(), Q_ref)
+        assert torch.allclose(Q.cpu().T @ v.cpu(), R_ref, atol=1e-4)
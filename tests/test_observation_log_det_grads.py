@@ -1,7 +1,8 @@
 import pytest
 import torch
+import numpy as np
 import functorch as ftch
-from bayes_dip.data import get_ray_trafo, get_kmnist_testset, SimulatedDataset
+from bayes_dip.data import get_ray_trafo, get_kmnist_testset, SimulatedDataset, MatmulRayTrafo
 from bayes_dip.dip import DeepImagePriorReconstructor
 from bayes_dip.probabilistic_models import get_default_unet_gaussian_prior_dicts, ParameterCov, NeuralBasisExpansion, ImageCov, ObservationCov, LowRankObservationCov
 from bayes_dip.marginal_likelihood_optim.observation_cov_log_det_grad import approx_observation_cov_log_det_grads
@@ -131,3 +132,76 @@ def test_approx_observation_log_det_grads_with_preconditioner(observation_cov, e
     for (name, p), exact_grad in zip(observation_cov.named_parameters(), exact_grads):
         print(name, grads[p], exact_grad)
         assert torch.allclose(grads[p], exact_grad, rtol=1., atol=1e-2)
+
+def _get_small_observation_cov(device):
+    torch.manual_seed(1)
+    im_shape = (16, 16)
+    obs_shape = (6, 23)
+    matrix = torch.rand(np.prod(obs_shape), np.prod(im_shape))
+    ray_trafo = MatmulRayTrafo(im_shape=im_shape, obs_shape=obs_shape, matrix=matrix).to(
+            device=device)
+    net_input = torch.rand(1, 1, *im_shape, device=device)
+    net_kwargs = {
+            'scales': 2,
+            'channels': [4, 4],
+            'skip_channels': [0, 1],
+            'use_norm': False,
+            'use_sigmoid': True,
+            'sigmoid_saturation_thresh': 15
+        }
+    reconstructor = DeepImagePriorReconstructor(
+            ray_trafo, torch_manual_seed=1, device=device, net_kwargs=net_kwargs)
+    prior_assignment_dict, hyperparams_init_dict = get_default_unet_gaussian_prior_dicts(
+            reconstructor.nn_model)
+    parameter_cov = ParameterCov(
+            reconstructor.nn_model, prior_assignment_dict, hyperparams_init_dict, device=device)
+    neural_basis_expansion = NeuralBasisExpansion(
+            nn_model=reconstructor.nn_model,
+            nn_input=net_input,
+            ordered_nn_params=parameter_cov.ordered_nn_params,
+            nn_out_shape=net_input.shape,
+    )
+    image_cov = ImageCov(
+            parameter_cov=parameter_cov,
+            neural_basis_expansion=neural_basis_expansion
+    )
+    return ObservationCov(trafo=ray_trafo, image_cov=image_cov, device=device)
+
+def _get_grads_with_and_without_cuda_side_stream(observation_cov):
+    grads_list = []
+    probe_bufs = []
+    for use_cuda_side_stream in [False, True]:
+        torch.manual_seed(1)
+        grads, _ = approx_observation_cov_log_det_grads(
+                observation_cov=observation_cov,
+                precon=None,
+                max_cg_iter=50,
+                cg_rtol=1e-6,
+                num_probes=10,
+                use_cuda_side_stream=use_cuda_side_stream,
+                )
+        grads_list.append(grads)
+        probe_bufs.append(observation_cov._probe_buf)  # pylint: disable=protected-access
+    # the persistent probe buffer should be reused by the second call
+    assert probe_bufs[0] is probe_bufs[1]
+    return grads_list
+
+def test_approx_observation_log_det_grads_cuda_side_stream_on_cpu():
+    """
+    Test that ``use_cuda_side_stream=True`` has no effect on CPU.
+    """
+    observation_cov = _get_small_observation_cov(device='cpu')
+    grads, grads_side_stream = _get_grads_with_and_without_cuda_side_stream(observation_cov)
+    for p in observation_cov.parameters():
+        assert torch.equal(grads_side_stream[p], grads[p])
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='requires CUDA')
+def test_approx_observation_log_det_grads_cuda_side_stream():
+    """
+    Test that ``use_cuda_side_stream=True`` gives the same gradients as ``False`` on CUDA, and that
+    the probe buffer is reused for ``device='cuda'`` (without device index).
+    """
+    observation_cov = _get_small_observation_cov(device='cuda')
+    grads, grads_side_stream = _get_grads_with_and_without_cuda_side_stream(observation_cov)
+    for p in observation_cov.parameters():
+        assert torch.allclose(grads_side_stream[p], grads[p], rtol=1e-4, atol=1e-6)
@@ -0,0 +1,84 @@
+"""
+Tests for :mod:`bayes_dip.utils.plot_utils`.
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
+from bayes_dip.utils import plot_utils  # pylint: disable=wrong-import-position
+
+@pytest.mark.parametrize(
+        'bins, hist_range', [(25, None), (10, (-1., 2.)), (7, (0., 0.5)), (1, None)])
+def test_numba_uniform_hist1d(bins, hist_range):
+    """
+    Test the numba histogram kernel and the bin edges computed by ``plot_hist``'s uniform-bin path
+    against :func:`numpy.histogram`.
+    """
+    pytest.importorskip('numba')
+    # pylint: disable=import-outside-toplevel
+    from bayes_dip.utils._hist_numba import uniform_hist1d
+
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(100000)
+    lo, hi = hist_range if hist_range is not None else (x.min(), x.max())
+    # include values exactly on the edges, the right one should be counted in the last bin
+    x[:10] = hi
+    x[10:20] = lo
+    n_ref, bins_ref = np.histogram(x, bins=bins, range=hist_range)
+
+    n = np.zeros(bins)
+    uniform_hist1d(x, float(lo), float(hi), bins, n)
+    assert np.array_equal(n, n_ref)
+
+    fast_histogram_available = plot_utils.FAST_HISTOGRAM_AVAILABLE
+    plot_utils.FAST_HISTOGRAM_AVAILABLE = False
+    try:
+        _, ax = plt.subplots()
+        # pylint: disable=protected-access
+        n, bins_edges = plot_utils._hist_uniform_bins(ax, x, bins=bins, range=hist_range)
+        plt.close(ax.figure)
+    finally:
+        plot_utils.FAST_HISTOGRAM_AVAILABLE = fast_histogram_available
+    assert np.array_equal(n, n_ref)
+    assert np.allclose(bins_edges, bins_ref)
+
+@pytest.mark.parametrize('backend', ['fast_histogram', 'numba'])
+@pytest.mark.parametrize('data_case', ['nan', 'empty', 'all_nan'])
+@pytest.mark.parametrize('density', [False, True])
+def test_hist_uniform_bins_nan_and_empty(backend, data_case, density):
+    """
+    Test that the uniform-bin path of ``plot_hist`` ignores NaN values like
+    :meth:`matplotlib.axes.Axes.hist`, and handles empty data.
+    """
+    pytest.importorskip(backend)
+    rng = np.random.default_rng(1)
+    if data_case == 'nan':
+        x = rng.standard_normal(1000)
+        x[::7] = np.nan
+    elif data_case == 'empty':
+        x = np.zeros(0)
+    else:
+        x = np.full(10, np.nan)
+
+    fast_histogram_available = plot_utils.FAST_HISTOGRAM_AVAILABLE
+    plot_utils.FAST_HISTOGRAM_AVAILABLE = backend == 'fast_histogram'
+    try:
+        _, ax = plt.subplots()
+        # pylint: disable=protected-access
+        n, bins_edges = plot_utils._hist_uniform_bins(
+                ax, x, bins=10, density=density, histtype='step')
+        if data_case == 'nan':
+            n_ref, bins_ref, _ = ax.hist(x, bins=10, density=density, histtype='step')
+        plt.close(ax.figure)
+    finally:
+        plot_utils.FAST_HISTOGRAM_AVAILABLE = fast_histogram_available
+
+    if data_case == 'nan':
+        assert np.allclose(n, n_ref)
+        assert np.allclose(bins_edges, bins_ref)
+    else:
+        # no counts, and the default range of numpy.histogram for empty data
+        assert np.array_equal(n, np.zeros(10))
+        assert np.allclose(bins_edges, np.linspace(0., 1., 11))
@@ -0,0 +1,88 @@
+"""
+Tests for :class:`bayes_dip.inference.SampleBasedPredictivePosterior`.
+"""
+
+import pytest
+import torch
+import numpy as np
+from bayes_dip.data import MatmulRayTrafo
+from bayes_dip.dip import DeepImagePriorReconstructor
+from bayes_dip.probabilistic_models import (
+        get_default_unet_gaussian_prior_dicts, ParameterCov, NeuralBasisExpansion, ImageCov,
+        ObservationCov)
+from bayes_dip.inference import SampleBasedPredictivePosterior
+
+@pytest.fixture(scope='session')
+def observation_cov():
+    torch.random.manual_seed(1)
+    im_shape = (16, 16)
+    obs_shape = (6, 23)
+    matrix = torch.rand(np.prod(obs_shape), np.prod(im_shape))
+    ray_trafo = MatmulRayTrafo(im_shape=im_shape, obs_shape=obs_shape, matrix=matrix)
+    net_input = torch.rand(1, 1, *im_shape)
+    net_kwargs = {
+                'scales': 2,
+                'channels': [4, 4],
+                'skip_channels': [0, 1],
+                'use_norm': False,
+                'use_sigmoid': True,
+                'sigmoid_saturation_thresh': 15}
+    reconstructor = DeepImagePriorReconstructor(
+            ray_trafo, torch_manual_seed=1, device='cpu', net_kwargs=net_kwargs)
+    prior_assignment_dict, hyperparams_init_dict = get_default_unet_gaussian_prior_dicts(
+            reconstructor.nn_model)
+    parameter_cov = ParameterCov(
+            reconstructor.nn_model,
+            prior_assignment_dict,
+            hyperparams_init_dict,
+            device='cpu'
+    )
+    neural_basis_expansion = NeuralBasisExpansion(
+            nn_model=reconstructor.nn_model,
+            nn_input=net_input,
+            ordered_nn_params=parameter_cov.ordered_nn_params,
+            nn_out_shape=net_input.shape,
+    )
+    image_cov = ImageCov(
+            parameter_cov=parameter_cov,
+            neural_basis_expansion=neural_basis_expansion
+    )
+    return ObservationCov(
+            trafo=ray_trafo,
+            image_cov=image_cov,
+            device='cpu'
+    )
+
+def test_sample_zero_mean_cg_with_converged_samples(observation_cov):
+    """
+    Test that sampling via CG works if some samples in a batch converge earlier than others, in
+    which case CG only passes the remaining columns to the observation covariance closure.
+    """
+    batch_size = 4
+    predictive_posterior = SampleBasedPredictivePosterior(observation_cov)
+
+    call_batch_sizes = []
+    orig_forward = observation_cov.forward
+    def forward_recording_batch_size(v, *args, **kwargs):
+        call_batch_sizes.append(v.shape[0])
+        return orig_forward(v, *args, **kwargs)
+    observation_cov.forward = forward_recording_batch_size
+    try:
+        torch.random.manual_seed(1)
+        samples = predictive_posterior.sample_zero_mean(
+                num_samples=batch_size, batch_size=batch_size, use_conj_grad_inv=True,
+                cg_kwargs={'max_niter': 100, 'rtol': 1e-6, 'stop_updating_after': 1e-3})
+    finally:
+        del observation_cov.forward
+
+    assert samples.shape == (batch_size, 1, *observation_cov.trafo.im_shape)
+    # CG must have been called with a subset of the columns at some point
+    assert batch_size in call_batch_sizes
+    assert min(call_batch_sizes) < batch_size
+
+    # compare to the samples obtained using a direct solve with the same random numbers
+    cov_obs_mat_chol = torch.linalg.cholesky(observation_cov.assemble_observation_cov())
+    torch.random.manual_seed(1)
+    samples_chol = predictive_posterior.sample_zero_mean(
+            num_samples=batch_size, batch_size=batch_size, cov_obs_mat_chol=cov_obs_mat_chol)
+    assert torch.linalg.norm(samples - samples_chol) / torch.linalg.norm(samples_chol) < 5e-2